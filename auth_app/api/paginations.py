@@ -0,0 +1,16 @@
+from coderr_app.api.limit_paginations import KeysetPagination, ListPagination
+
+
+class ProfileKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination for the profile listings on ``(created_at, user_id)``, newest first.
+    """
+    page_size = 20
+    cursor_field = 'created_at'
+
+
+class ProfileRankingPagination(ListPagination):
+    """
+    Page number pagination for business profiles ordered by their rating,
+    which cannot be paged with a ``created_at`` cursor.
+    """
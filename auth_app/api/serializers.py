@@ -1,7 +1,9 @@
 from rest_framework import serializers
-from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from django.db import transaction
+from rest_framework.authtoken.models import Token
 from auth_app.models import Profile
+from coderr_app.images import variant_url
 
 
 class LoginWithEmailSerializer(serializers.ModelSerializer):
@@ -27,6 +29,10 @@ class LoginWithEmailSerializer(serializers.ModelSerializer):
         """
         Validate the login data by checking username and password.
 
+        The user is loaded together with its token in a single query and the
+        password is checked on that instance, instead of looking the user up
+        again through ``authenticate()``.
+
         Args:
             data (dict): The data to validate containing username and password.
 
@@ -38,14 +44,14 @@ class LoginWithEmailSerializer(serializers.ModelSerializer):
         """
         username = data.get('username')
         password = data.get('password')
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            raise serializers.ValidationError('Invalid email or password')
-
-        user = authenticate(username=username, password=password)
+        user = User.objects.select_related('auth_token').filter(username=username).first()
 
         if user is None:
+            # Run the password hasher anyway so unknown usernames take as long as wrong passwords.
+            User().set_password(password)
+            raise serializers.ValidationError('Invalid email or password')
+
+        if not user.check_password(password) or not user.is_active:
             raise serializers.ValidationError('Invalid email or password')
 
         data['user'] = user
@@ -74,7 +80,8 @@ class RegistrationSerializer(serializers.ModelSerializer):
         }
         
     def save(self):
-        ''' if all required informations was correct, create a user.
+        ''' if all required informations was correct, create a user
+        with its profile and token in one transaction.
 
         Raises:
             serializers.ValidationError: password don't match
@@ -97,9 +104,11 @@ class RegistrationSerializer(serializers.ModelSerializer):
         
         account = User(email = self.validated_data['email'], username = self.validated_data['username'])
         account.set_password(pw)
-        account.save()
-        account.profile.type = profile_type
-        account.profile.save()
+        # read by the create_user_profile signal, so the profile is inserted with its final type
+        account._profile_type = profile_type
+        with transaction.atomic():
+            account.save()
+            Token.objects.create(user=account)
         return account
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -167,7 +176,21 @@ class ProfileSerializer(serializers.ModelSerializer):
         user.save()
         return instance
         
-class ProfileCustomerSerialiser(serializers.ModelSerializer):
+class ProjectedFieldsMixin:
+    """
+    Serializer mixin that only renders the fields listed in ``context['fields']``.
+
+    Without the context entry all fields of the serializer are rendered.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class ProfileCustomerSerialiser(ProjectedFieldsMixin, serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     first_name = serializers.CharField(source='user.first_name')
     last_name = serializers.CharField(source='user.last_name')
@@ -177,16 +200,36 @@ class ProfileCustomerSerialiser(serializers.ModelSerializer):
         fields = ['user','username', 'first_name', 'last_name', 'file', 'type' ]  
         
     def get_file(self, obj):
-        return obj.file.url if obj.file else '' 
+        return variant_url(obj.file, obj.file_variants, 'small') or ''
     
-class ProfileBusinessSerialiser(serializers.ModelSerializer):
+class ProfileBusinessSerialiser(ProjectedFieldsMixin, serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     first_name = serializers.CharField(source='user.first_name')
     last_name = serializers.CharField(source='user.last_name')
     file = serializers.SerializerMethodField()
+    rating = serializers.SerializerMethodField()
     class Meta:
         model = Profile
-        fields = ['user','username', 'first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'type' ] 
+        fields = ['user','username', 'first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'type', 'rating' ] 
     
     def get_file(self, obj):
-        return obj.file.url if obj.file else ''
\ No newline at end of file
+        return variant_url(obj.file, obj.file_variants, 'small') or ''
+
+    def get_rating(self, obj):
+        """
+        Get the precomputed review statistics of the business user.
+
+        Args:
+            obj (Profile): The Profile instance.
+
+        Returns:
+            dict: The review count, average rating and rating histogram.
+        """
+        summary = getattr(obj.user, 'rating_summary', None)
+        if summary is None:
+            return {'review_count': 0, 'average_rating': 0, 'histogram': {rating: 0 for rating in range(1, 6)}}
+        return {
+            'review_count': summary.review_count,
+            'average_rating': float(summary.average_rating),
+            'histogram': summary.histogram,
+        }
\ No newline at end of file
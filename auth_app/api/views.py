@@ -1,3 +1,4 @@
+from django.db.models import F
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.generics import ListAPIView, RetrieveUpdateAPIView
@@ -5,8 +6,11 @@ from rest_framework.views import APIView
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
 from auth_app.models import Profile
 from .serializers import LoginWithEmailSerializer, RegistrationSerializer, ProfileSerializer, ProfileCustomerSerialiser, ProfileBusinessSerialiser
+from .authentication import invalidate_user_auth_cache
+from .paginations import ProfileKeysetPagination, ProfileRankingPagination
 from .permissions import IsOwnerOrReadOnly
 
 class RegistrationView(APIView):
@@ -26,9 +30,8 @@ class RegistrationView(APIView):
 
         if serializer.is_valid():
             saved_account = serializer.save()
-            token, created = Token.objects.get_or_create(user=saved_account)
             data = {
-                'token': token.key,
+                'token': saved_account.auth_token.key,
                 'username': saved_account.username,
                 'email': saved_account.email,
                 'user_id': saved_account.id,
@@ -61,7 +64,7 @@ class LoginView(ObtainAuthToken):
         data = {}
         if serializer.is_valid():
             user = serializer.validated_data['user']
-            token, created = Token.objects.get_or_create(user = user)
+            token = getattr(user, 'auth_token', None) or Token.objects.create(user = user)
             data = {
                 'token': token.key,
                 'username': user.username,
@@ -78,33 +81,129 @@ class LogoutView(APIView):
     def post(self, request):
         """
         Logout user by delete the token in the Token database
+        and drop its cached lookup.
         """
-        request.user.auth_token.delete() 
+        request.user.auth_token.delete()
+        invalidate_user_auth_cache(request.user.id)
         return Response({"detail": "Logout Successfully. Your Token was deleted"}, status=status.HTTP_200_OK)
     
-class ProfilesBusinessListView(ListAPIView):
+class ProfileListMixin:
+    """
+    Shared behaviour of the profile listings.
+
+    Profiles are paged with a ``(created_at, user_id)`` cursor and joined to
+    their user in the same query. ``?fields=user,username`` limits both the
+    rendered fields and the selected columns, so long text columns such as
+    ``description`` are not read when they are not needed.
+    """
     permission_classes = [IsAuthenticated]
+    pagination_class = ProfileKeysetPagination
+    profile_type = None
+    fields_query_param = 'fields'
+    field_columns = {
+        'user': ['user'],
+        'username': ['user__username'],
+        'first_name': ['user__first_name'],
+        'last_name': ['user__last_name'],
+        'file': ['file', 'file_variants'],
+        'location': ['location'],
+        'tel': ['tel'],
+        'description': ['description'],
+        'working_hours': ['working_hours'],
+        'type': ['type'],
+        'rating': [
+            'user__rating_summary__review_count', 'user__rating_summary__average_rating',
+            'user__rating_summary__rating_1', 'user__rating_summary__rating_2', 'user__rating_summary__rating_3',
+            'user__rating_summary__rating_4', 'user__rating_summary__rating_5',
+        ],
+    }
+
+    def get_projected_fields(self):
+        """
+        Parse the ``fields`` query parameter.
+
+        Returns:
+            list: The requested field names, or None if all fields are requested.
+
+        Raises:
+            ValidationError: If an unknown field is requested.
+        """
+        if not hasattr(self, '_projected_fields'):
+            value = self.request.query_params.get(self.fields_query_param, '')
+            fields = [name.strip() for name in value.split(',') if name.strip()] or None
+            if fields is not None:
+                unknown = sorted(set(fields) - set(self.serializer_class.Meta.fields))
+                if unknown:
+                    raise ValidationError({self.fields_query_param: [f'Unknown field: {name}' for name in unknown]})
+            self._projected_fields = fields
+        return self._projected_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_projected_fields()
+        return context
+
+    def get_queryset(self):
+        """
+        Get the profiles of this listing's type, joined to the related rows the response needs.
+
+        Returns:
+            QuerySet: Profiles with ``profile_type``, restricted to the projected columns.
+        """
+        fields = self.get_projected_fields() or self.serializer_class.Meta.fields
+        columns = ['user', 'type', 'created_at']
+        for name in fields:
+            columns.extend(self.field_columns[name])
+        related = {'user__rating_summary' if '__rating_summary__' in column else 'user' for column in columns if column.startswith('user__')}
+        queryset = Profile.objects.filter(type=self.profile_type)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
+
+
+class ProfilesBusinessListView(ProfileListMixin, ListAPIView):
+    """
+    API view to list business profiles with their rating summary.
+
+    Supports ``?ordering=-average_rating`` (or ``average_rating``) to sort by
+    the precomputed average rating; these listings are paged by page number.
+    Requires authentication.
+    """
     serializer_class = ProfileBusinessSerialiser
+    profile_type = 'business'
+    rating_orderings = {
+        'average_rating': F('user__rating_summary__average_rating').asc(nulls_first=True),
+        '-average_rating': F('user__rating_summary__average_rating').desc(nulls_last=True),
+    }
+
+    def get_rating_ordering(self):
+        return self.rating_orderings.get(self.request.query_params.get('ordering'))
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.get_rating_ordering() is None:
+                self._paginator = self.pagination_class()
+            else:
+                self._paginator = ProfileRankingPagination()
+        return self._paginator
+
     def get_queryset(self):
-        return Profile.objects.filter(type ='business')
+        queryset = super().get_queryset()
+        ordering = self.get_rating_ordering()
+        if ordering is not None:
+            queryset = queryset.order_by(ordering, 'pk')
+        return queryset
    
     
-class ProfilesCustomerListView(ListAPIView):
+class ProfilesCustomerListView(ProfileListMixin, ListAPIView):
     """
     API view to list customer profiles.
 
     Requires authentication.
     """
-    permission_classes = [IsAuthenticated]
     serializer_class = ProfileCustomerSerialiser
-    def get_queryset(self):
-        """
-        Get the queryset for customer profiles.
-
-        Returns:
-            QuerySet: Profiles with type 'customer'.
-        """
-        return Profile.objects.filter(type ='customer')
+    profile_type = 'customer'
     
     
 class UserProfileGetUpdateView(RetrieveUpdateAPIView):
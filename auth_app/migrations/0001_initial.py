@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Profile',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('file', models.ImageField(blank=True, default='', upload_to='profiles/')),
+                ('location', models.CharField(blank=True, default='', max_length=255)),
+                ('tel', models.CharField(blank=True, default='', max_length=30)),
+                ('description', models.TextField(blank=True, default='')),
+                ('working_hours', models.CharField(blank=True, default='', max_length=50)),
+                ('type', models.CharField(choices=[('customer', 'Customer'), ('business', 'Business')], default='customer', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['type'], name='profile_type_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='profile',
+            name='profile_type_idx',
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['type', '-created_at'], name='profile_type_created_idx'),
+        ),
+    ]
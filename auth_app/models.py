@@ -7,7 +7,8 @@ class Profile(models.Model):
 
     This model extends the default Django User model with additional fields
     such as profile image, location, telephone, description, working hours,
-    and user type (customer or business).
+    and user type (customer or business). ``file_variants`` holds the storage
+    names of the resized WebP versions of the profile image.
     '''
     USER_TYPES = (
         ('customer', 'Customer'),
@@ -16,6 +17,7 @@ class Profile(models.Model):
 
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile', primary_key=True)
     file = models.ImageField(upload_to='profiles/', default='', blank=True)
+    file_variants = models.JSONField(default=dict, blank=True)
     location = models.CharField(max_length=255, blank=True, default='')
     tel = models.CharField(max_length=30, blank=True, default='')
     description = models.TextField(blank=True, default='')
@@ -23,6 +25,20 @@ class Profile(models.Model):
     type = models.CharField(max_length=20, choices=USER_TYPES, default='customer')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['type', '-created_at'], name='profile_type_created_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        '''
+        Remember the stored type so signal receivers can detect type changes.
+        '''
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_type = instance.__dict__.get('type')
+        return instance
+
     def __str__(self):
         '''
         Return the username of the associated user as the string representation.
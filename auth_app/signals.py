@@ -1,6 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from coderr_app.images import enqueue_image_processing, is_new_upload, reset_image_variants
+from .api.authentication import invalidate_user_auth_cache
 from .models import Profile
 
 @receiver(post_save, sender=User)
@@ -10,7 +13,8 @@ def create_user_profile(sender, instance, created, **kwargs):
 
     This function is triggered after a User instance is saved. If the User
     was newly created, it automatically creates a corresponding Profile
-    instance linked to that User.
+    instance linked to that User. The profile type can be preset on the
+    User instance as ``_profile_type`` (defaults to 'customer').
 
     Args:
         sender: The model class (User) that sent the signal.
@@ -19,4 +23,45 @@ def create_user_profile(sender, instance, created, **kwargs):
         **kwargs: Additional keyword arguments from the signal.
     """
     if created:
-        Profile.objects.create(user=instance)
+        Profile.objects.create(user=instance, type=getattr(instance, '_profile_type', 'customer'))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=Token)
+def invalidate_auth_cache(sender, instance, **kwargs):
+    """
+    Signal receiver to drop the cached authentication lookups of a user.
+
+    The cached lookups hold the user and its profile, so they are invalidated
+    whenever one of them is saved or deleted, or the token is deleted.
+
+    Args:
+        sender: The model class (User, Profile or Token) that sent the signal.
+        instance: The instance being saved or deleted.
+        **kwargs: Additional keyword arguments from the signal.
+    """
+    user_id = instance.pk if sender is User else instance.user_id
+    invalidate_user_auth_cache(user_id)
+
+
+@receiver(pre_save, sender=Profile)
+def reset_profile_image_variants(sender, instance, **kwargs):
+    """
+    Signal receiver to drop the variants of a replaced or cleared profile image.
+
+    A new upload is flagged so that its processing is enqueued after the save.
+    """
+    instance._file_uploaded = is_new_upload(instance.file)
+    instance.file_variants = reset_image_variants(instance.file, instance.file_variants)
+
+
+@receiver(post_save, sender=Profile)
+def process_profile_image(sender, instance, **kwargs):
+    """
+    Signal receiver to enqueue the stripping and variant generation of a newly uploaded profile image.
+    """
+    if instance.__dict__.pop('_file_uploaded', False):
+        enqueue_image_processing(instance, 'file', 'file_variants')
@@ -1,4 +1,13 @@
+import base64
+from unittest import mock
 from django.urls import reverse
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from auth_app.api.authentication import CachedBasicAuthentication, basic_cache_key, token_cache_key
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase, APIClient
@@ -27,6 +36,15 @@ class UserRegistrationTest(APITestCase):
         profile = Profile.objects.get(user=user)
         self.assertEqual(profile.type, 'customer')
         self.assertTrue(user.check_password('examplePassword'))
+        self.assertEqual(response.data['token'], Token.objects.get(user=user).key)
+
+    def test_user_registration_query_count(self):
+        data = dict(self.valid_data, type='business')
+        # email check, user insert, profile insert, token insert and the transaction savepoints
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Profile.objects.get(user_id=response.data['user_id']).type, 'business')
         
 class UserLoginTest(APITestCase):
     def setUp(self):
@@ -43,10 +61,144 @@ class UserLoginTest(APITestCase):
         response = self.client.post(self.url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_login_query_count(self):
+        data = {
+            'username': self.user.username,
+            'password': self.password
+        }
+        # user lookup joined with its token, then the token insert
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, data, format='json')
+        # the existing token comes with the user lookup
+        with self.assertNumQueries(1):
+            second_response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.data['token'], second_response.data['token'])
+
+    def test_login_unknown_user(self):
+        data = {
+            'username': 'UnknownUser',
+            'password': self.password
+        }
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_login_errors(self):
         data = {
             'username': self.user.username,
             'password': 'ThisIsTheWrongPassword'
         }
         response = self.client.post(self.url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CachedTokenAuthenticationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='TestUser', password='examplePassword')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = reverse('profile-detail', kwargs={'pk': self.user.id})
+
+    def test_warm_cache_runs_no_auth_queries(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_profile_save_invalidates_cache(self):
+        self.client.get(self.url)
+        profile = Profile.objects.get(user=self.user)
+        profile.type = 'business'
+        profile.save()
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+
+    def test_logout_invalidates_cache(self):
+        self.client.get(self.url)
+        response = self.client.post(reverse('logout'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+SHARED_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'test_shared_cache'}}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class SharedCacheInvalidationTest(APITestCase):
+    """
+    Invalidation must reach every process through the shared cache. The other
+    worker is simulated by a separate cache instance that shares nothing with
+    this process but the cache table.
+    """
+
+    def setUp(self):
+        call_command('createcachetable', verbosity=0)
+        self.user = User.objects.create_user(username='TestUser', password='examplePassword')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = reverse('profile-detail', kwargs={'pk': self.user.id})
+
+    def get_from_other_worker(self):
+        with mock.patch('auth_app.api.authentication.cache', self.other_worker_cache):
+            return self.client.get(self.url)
+
+    def warm_other_worker(self):
+        self.other_worker_cache = DatabaseCache('test_shared_cache', {})
+        self.assertEqual(self.get_from_other_worker().status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(self.other_worker_cache.get(token_cache_key(self.token.key)))
+
+    def test_logout_invalidates_other_workers(self):
+        self.warm_other_worker()
+        response = self.client.post(reverse('logout'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_from_other_worker().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected_by_other_workers(self):
+        self.warm_other_worker()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get_from_other_worker().status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_password_change_invalidates_basic_credentials_of_other_workers(self):
+        other_worker_cache = DatabaseCache('test_shared_cache', {})
+        credentials = base64.b64encode(b'TestUser:examplePassword').decode()
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION='Basic ' + credentials)
+        with mock.patch('auth_app.api.authentication.cache', other_worker_cache):
+            CachedBasicAuthentication().authenticate(request)
+        self.assertIsNotNone(other_worker_cache.get(basic_cache_key('TestUser', 'examplePassword')))
+
+        self.user.set_password('newPassword')
+        self.user.save()
+        with mock.patch('auth_app.api.authentication.cache', other_worker_cache), self.assertRaises(AuthenticationFailed):
+            CachedBasicAuthentication().authenticate(request)
+
+class CachedBasicAuthenticationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='TestUser', password='examplePassword')
+        self.authentication = CachedBasicAuthentication()
+
+    def basic_request(self, password):
+        credentials = base64.b64encode(f'TestUser:{password}'.encode()).decode()
+        return APIRequestFactory().get('/', HTTP_AUTHORIZATION='Basic ' + credentials)
+
+    def test_verified_credentials_are_cached(self):
+        user, auth = self.authentication.authenticate(self.basic_request('examplePassword'))
+        self.assertEqual(user, self.user)
+        with self.assertNumQueries(0):
+            user, auth = self.authentication.authenticate(self.basic_request('examplePassword'))
+        self.assertEqual(user, self.user)
+
+    def test_wrong_password_is_not_cached(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate(self.basic_request('wrongPassword'))
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate(self.basic_request('wrongPassword'))
+
+    def test_password_change_invalidates_cache(self):
+        self.authentication.authenticate(self.basic_request('examplePassword'))
+        self.user.set_password('newPassword')
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate(self.basic_request('examplePassword'))
@@ -1,9 +1,12 @@
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from auth_app.models import Profile
+from coderr_app.models import RatingSummary
 
 class TestProfile(APITestCase):
     
@@ -42,10 +45,62 @@ class TestProfile(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
+    def test_get_business_sorted_by_rating(self):
+        RatingSummary.record(self.user3.id, added=2)
+        RatingSummary.record(self.user4.id, added=5)
+        url = reverse('profiles-list-business')
+        response = self.client.get(url, {'ordering': '-average_rating'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([profile['user'] for profile in results], [self.user4.id, self.user3.id])
+        self.assertEqual(results[0]['rating']['average_rating'], 5.0)
+        self.assertEqual(results[0]['rating']['histogram'][5], 1)
+        
     def test_get_all_customer(self):
         url = reverse('profiles-list-customer')
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({profile['user'] for profile in response.data['results']}, {self.user1.id, self.user2.id})
+
+    def test_profile_list_cursor_pages(self):
+        url = reverse('profiles-list-business')
+        response = self.client.get(url, {'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+        first = response.data['results'][0]['user']
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+        self.assertEqual({first, response.data['results'][0]['user']}, {self.user3.id, self.user4.id})
+
+    def test_profile_list_joins_users(self):
+        for index in range(5):
+            user = User.objects.create_user(username=f'business{index}', password='testpassword')
+            Profile.objects.filter(user=user).update(type='business')
+        url = reverse('profiles-list-business')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertEqual(sum('FROM "auth_app_profile"' in query['sql'] for query in queries), 1)
+        self.assertFalse(any(query['sql'].startswith('SELECT') and 'FROM "auth_user"' in query['sql'] for query in queries))
+
+    def test_profile_list_field_projection(self):
+        url = reverse('profiles-list-business')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'fields': 'user,username'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'user', 'username'})
+        profile_query = next(query['sql'] for query in queries if 'FROM "auth_app_profile"' in query['sql'])
+        self.assertNotIn('"description"', profile_query)
+
+    def test_profile_list_unknown_field(self):
+        url = reverse('profiles-list-customer')
+        response = self.client.get(url, {'fields': 'user,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
     
     def test_get_detail_profile(self):
@@ -0,0 +1,73 @@
+"""
+Benchmark: requests per second of an authenticated endpoint per authentication mode.
+
+Compares plain BasicAuthentication (full password hash on every request),
+CachedBasicAuthentication and CachedTokenAuthentication on the profile
+detail endpoint, against a throwaway test database.
+
+Usage:
+    python benchmarks/bench_auth.py [--requests 200]
+"""
+import argparse
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django
+
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test.utils import setup_databases, teardown_databases, setup_test_environment
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory
+from auth_app.api.authentication import CachedBasicAuthentication, CachedTokenAuthentication
+from auth_app.api.views import UserProfileGetUpdateView
+
+
+def run(authentication_class, authorization, user_id, requests):
+    """
+    Send ``requests`` GET requests through the view and return the requests per second.
+    """
+    view = UserProfileGetUpdateView.as_view(authentication_classes=[authentication_class])
+    factory = APIRequestFactory()
+    cache.clear()
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = view(factory.get(f'/api/profile/{user_id}/', HTTP_AUTHORIZATION=authorization), pk=user_id)
+        assert response.status_code == 200, response.status_code
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        user = User.objects.create_user(username='bench', password='benchPassword123')
+        token = Token.objects.create(user=user)
+        basic = 'Basic ' + base64.b64encode(b'bench:benchPassword123').decode()
+
+        modes = [
+            ('BasicAuthentication', BasicAuthentication, basic),
+            ('CachedBasicAuthentication', CachedBasicAuthentication, basic),
+            ('CachedTokenAuthentication', CachedTokenAuthentication, 'Token ' + token.key),
+        ]
+        print(f'{"mode":<28}{"req/s":>10}')
+        for name, authentication_class, authorization in modes:
+            print(f'{name:<28}{run(authentication_class, authorization, user.id, args.requests):>10.1f}')
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: bytes transferred for one offer list page with and without image variants.
+
+Creates a page of offers with camera-sized JPEG uploads in a throwaway test
+database and media directory, fetches the offer list once and adds up the
+JSON response and every image it links to. The originals (what the list
+served before) are compared with the WebP variants served now.
+
+Usage:
+    python benchmarks/bench_image_bytes.py [--offers 6] [--width 4000] [--height 3000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from io import BytesIO
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django
+
+django.setup()
+
+from PIL import Image
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, teardown_databases, setup_test_environment
+from auth_app.models import Profile
+from coderr_app.jobs import run_pending_jobs
+from coderr_app.models import Offer
+
+
+def photo(index, width, height):
+    """
+    Return a noisy JPEG upload that compresses like a photograph.
+    """
+    noise = Image.effect_noise((width, height), 64).convert('RGB')
+    tint = Image.new('RGB', (width, height), ((index * 40) % 255, 120, 200))
+    buffer = BytesIO()
+    Image.blend(noise, tint, 0.5).save(buffer, format='JPEG', quality=90)
+    return SimpleUploadedFile(f'photo-{index}.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+def file_size(url):
+    path = urlparse(url).path
+    return os.path.getsize(os.path.join(settings.MEDIA_ROOT, path[len(settings.MEDIA_URL):]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--offers', type=int, default=6)
+    parser.add_argument('--width', type=int, default=4000)
+    parser.add_argument('--height', type=int, default=3000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            user = User.objects.create_user(username='bench-business', password='benchPassword123')
+            Profile.objects.filter(user=user).update(type='business')
+            offers = [
+                Offer.objects.create(user=user, title=f'Offer {index}', description='Benchmark', image=photo(index, args.width, args.height))
+                for index in range(args.offers)
+            ]
+            original_bytes = sum(offer.image.size for offer in offers)
+            run_pending_jobs()
+
+            response = Client().get('/api/offers/', {'page_size': args.offers})
+            page = response.json()
+            json_bytes = len(response.content)
+            variant_bytes = sum(file_size(offer['image']) for offer in page['results'])
+
+            print(f'{"images":<20}{"JSON":>12}{"images":>14}{"total":>14}')
+            for name, image_bytes in (('originals', original_bytes), ('medium WebP', variant_bytes)):
+                print(f'{name:<20}{json_bytes:>12,}{image_bytes:>14,}{json_bytes + image_bytes:>14,}')
+            print(f'{"reduction":<20}{"":>12}{"":>14}{original_bytes / max(variant_bytes, 1):>13.1f}x')
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Load test: order creation throughput under concurrent writers per database configuration.
+
+Every writer thread creates orders through the order endpoint (an async view,
+called like the WSGI handler does with ``async_to_sync``) and releases its
+connection like a finished request would (``close_old_connections``), so
+``CONN_MAX_AGE`` and pooling take effect. The configured database engine is
+compared against its untuned baseline:
+
+- sqlite:     rollback journal, deferred transactions, a new connection per request
+              versus the configured WAL / busy timeout / IMMEDIATE settings.
+- postgresql: a new connection per request versus persistent connections,
+              and the psycopg pool if psycopg_pool is installed.
+
+A throwaway test database is used (a temporary file for SQLite, so the
+journal mode and locking behave like a real deployment).
+
+Usage:
+    python benchmarks/bench_orders.py [--writers 1 4 8] [--orders 100]
+    DATABASE_ENGINE=postgresql python benchmarks/bench_orders.py
+"""
+import argparse
+import copy
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django
+
+django.setup()
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.db import close_old_connections, connections
+from django.test.utils import setup_databases, teardown_databases, setup_test_environment
+from rest_framework.test import APIRequestFactory, force_authenticate
+from auth_app.models import Profile
+from coderr_app.api.views import OrderViewSet
+from coderr_app.models import Offer, OfferDetail, Order
+
+
+def configurations(settings_dict):
+    """
+    Return the (name, settings overrides) pairs to compare for the configured engine.
+    """
+    if settings_dict['ENGINE'].endswith('sqlite3'):
+        return [
+            ('sqlite baseline', {'CONN_MAX_AGE': 0, 'OPTIONS': {'init_command': 'PRAGMA journal_mode=DELETE; PRAGMA synchronous=FULL;'}}),
+            ('sqlite tuned', {}),
+        ]
+    options = {key: value for key, value in settings_dict['OPTIONS'].items() if key != 'pool'}
+    configs = [
+        ('postgresql per-request', {'CONN_MAX_AGE': 0, 'OPTIONS': options}),
+        ('postgresql persistent', {'CONN_MAX_AGE': 60, 'OPTIONS': options}),
+    ]
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        print('psycopg_pool is not installed, skipping the pooled configuration.')
+    else:
+        configs.append(('postgresql pool', {'CONN_MAX_AGE': 0, 'OPTIONS': {**options, 'pool': {'min_size': 2, 'max_size': 16}}}))
+    return configs
+
+
+def writer(view, detail_id, customer, orders, errors):
+    factory = APIRequestFactory()
+    try:
+        for _ in range(orders):
+            request = factory.post('/api/orders/', {'offer_detail_id': detail_id}, format='json')
+            force_authenticate(request, user=customer)
+            try:
+                response = async_to_sync(view)(request)
+                if response.status_code != 201:
+                    errors.append(response.status_code)
+            except Exception as error:
+                errors.append(type(error).__name__)
+            close_old_connections()
+    finally:
+        connections.close_all()
+
+
+def run(writers, orders, detail_id, customer):
+    """
+    Create ``writers * orders`` orders from concurrent threads.
+
+    Returns:
+        tuple: Created orders per second and the number of failed requests.
+    """
+    view = OrderViewSet.as_view({'post': 'create'})
+    errors = []
+    threads = [threading.Thread(target=writer, args=(view, detail_id, customer, orders, errors)) for _ in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return (writers * orders - len(errors)) / elapsed, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writers', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--orders', type=int, default=100, help='Orders created by each writer.')
+    args = parser.parse_args()
+
+    settings_dict = connections['default'].settings_dict
+    with tempfile.TemporaryDirectory() as directory:
+        if settings_dict['ENGINE'].endswith('sqlite3'):
+            settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(directory, 'bench_orders.sqlite3')
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        original = copy.deepcopy({key: settings_dict[key] for key in ('CONN_MAX_AGE', 'OPTIONS')})
+        try:
+            business = User.objects.create_user(username='bench-business', password='benchPassword123')
+            Profile.objects.filter(user=business).update(type='business')
+            customer = User.objects.create_user(username='bench-customer', password='benchPassword123')
+            offer = Offer.objects.create(user=business, title='Benchmark', description='Benchmark offer')
+            detail = OfferDetail.objects.create(offer=offer, title='Basic', revisions=1, delivery_time_in_days=3, price=50, features=[], offer_type='basic')
+            connections.close_all()
+
+            print(f'{"configuration":<26}{"writers":>8}{"orders/s":>10}{"errors":>8}')
+            for name, overrides in configurations(settings_dict):
+                settings_dict.update(copy.deepcopy(original))
+                settings_dict.update(overrides)
+                for writers in args.writers:
+                    rate, errors = run(writers, args.orders, detail.id, customer)
+                    print(f'{name:<26}{writers:>8}{rate:>10.1f}{errors:>8}')
+                Order.objects.all().delete()
+                connections.close_all()
+        finally:
+            settings_dict.update(original)
+            teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
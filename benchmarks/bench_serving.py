@@ -0,0 +1,144 @@
+"""
+Benchmark: requests per second of the development server against the production serving setup.
+
+Starts each server on a fresh SQLite database filled with sample offers and
+sends GET requests to an API listing from concurrent client threads:
+
+- runserver:     ``manage.py runserver`` with DEBUG on (the previous Docker setup).
+- gunicorn-wsgi: gunicorn with deploy/gunicorn.conf.py, DEBUG off.
+- gunicorn-asgi: the same with SERVER_INTERFACE=asgi (uvicorn workers).
+
+Servers whose packages are not installed (``pip install -r requirements-prod.txt``)
+are skipped.
+
+Usage:
+    python benchmarks/bench_serving.py [--path /api/offers/] [--clients 16] [--seconds 10]
+"""
+import argparse
+import http.client
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 8765
+
+
+def servers():
+    """
+    Return the (name, command, environment) triples of the servers to compare.
+    """
+    production = {
+        'DJANGO_DEBUG': 'false', 'DJANGO_ALLOWED_HOSTS': '127.0.0.1', 'BIND': f'127.0.0.1:{PORT}', 'ACCESS_LOG': '',
+        # Several workers need a shared cache; the cache table lives in the benchmark database.
+        'CACHE_BACKEND': 'database',
+    }
+    gunicorn = [sys.executable, '-m', 'gunicorn', '-c', 'deploy/gunicorn.conf.py']
+    return [
+        ('runserver', [sys.executable, 'manage.py', 'runserver', '--noreload', f'127.0.0.1:{PORT}'], {'DJANGO_DEBUG': 'true'}, None),
+        ('gunicorn-wsgi', gunicorn, {**production, 'SERVER_INTERFACE': 'wsgi'}, 'gunicorn'),
+        ('gunicorn-asgi', gunicorn, {**production, 'SERVER_INTERFACE': 'asgi'}, 'uvicorn_worker'),
+    ]
+
+
+def prepare_database(env, offers):
+    """
+    Migrate the benchmark database and create sample offers.
+    """
+    subprocess.run([sys.executable, 'manage.py', 'migrate', '-v0'], cwd=ROOT, env=env, check=True)
+    subprocess.run([sys.executable, 'manage.py', 'createcachetable'], cwd=ROOT, env={**env, 'CACHE_BACKEND': 'database'}, check=True)
+    script = (
+        'from django.contrib.auth.models import User\n'
+        'from auth_app.models import Profile\n'
+        'from coderr_app.bulk import bulk_create_offers\n'
+        "user = User.objects.create_user(username='bench-business', password='benchPassword123')\n"
+        "Profile.objects.filter(user=user).update(type='business')\n"
+        "details = [{'title': t, 'revisions': 1, 'delivery_time_in_days': 3, 'price': 100, 'features': ['x'], 'offer_type': t} for t in ('basic', 'standard', 'premium')]\n"
+        f"bulk_create_offers(user, [{{'title': f'Offer {{i}}', 'description': 'Benchmark offer', 'details': details}} for i in range({offers})])\n"
+    )
+    subprocess.run([sys.executable, 'manage.py', 'shell', '-c', script], cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def wait_until_ready(timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=1)
+            connection.request('GET', '/api/base-info/')
+            connection.getresponse().read()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def load(path, clients, seconds):
+    """
+    Send requests from ``clients`` keep-alive connections for ``seconds``.
+
+    Returns:
+        tuple: Requests per second and the number of failed requests.
+    """
+    counts, errors = [0] * clients, [0] * clients
+    deadline = time.monotonic() + seconds
+
+    def client(index):
+        connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=10)
+        while time.monotonic() < deadline:
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                if response.status == 200:
+                    counts[index] += 1
+                else:
+                    errors[index] += 1
+            except (OSError, http.client.HTTPException):
+                errors[index] += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=10)
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / seconds, sum(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default='/api/offers/')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=int, default=10)
+    parser.add_argument('--offers', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = {**os.environ, 'SQLITE_PATH': os.path.join(directory, 'bench_serving.sqlite3'), 'DJANGO_SETTINGS_MODULE': 'core.settings'}
+        prepare_database(env, args.offers)
+
+        print(f'{"server":<16}{"req/s":>10}{"errors":>8}')
+        for name, command, server_env, module in servers():
+            if module and importlib.util.find_spec(module) is None:
+                print(f'{name:<16}{"skipped (" + module + " not installed)":>30}')
+                continue
+            process = subprocess.Popen(command, cwd=ROOT, env={**env, **server_env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                if not wait_until_ready():
+                    print(f'{name:<16}{"did not start":>18}')
+                    continue
+                rate, errors = load(args.path, args.clients, args.seconds)
+                print(f'{name:<16}{rate:>10.1f}{errors:>8}')
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import hashlib
+import json
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from coderr_app.list_cache import (
+    acount_offer_list_lookup, aget_offer_list_page, aget_offer_list_version, aset_offer_list_page, offer_list_cache_key,
+)
+
+
+class AnonymousListCacheMixin:
+    """
+    Viewset mixin that caches the list responses served to anonymous users.
+
+    Pages are keyed on the normalized query string under the current offer
+    list version (see ``coderr_app.list_cache``), which the offer signals bump
+    on every relevant write. The cache is read with the async cache API, so
+    database and Redis backends do not block the event loop. Responses carry an ETag and conditional requests
+    are answered with 304 Not Modified; ``X-Cache`` tells hits from misses.
+    Must be combined with ``AsyncReadViewSetMixin``.
+    """
+
+    async def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return await super().list(request, *args, **kwargs)
+
+        key = offer_list_cache_key(await aget_offer_list_version(), request.get_host(), request.query_params)
+        page = await aget_offer_list_page(key)
+        await acount_offer_list_lookup(page is not None)
+        if page is None:
+            response = await super().list(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            page = {
+                'etag': quote_etag(hashlib.md5(json.dumps(response.data, cls=JSONEncoder, sort_keys=True).encode()).hexdigest()),
+                'data': response.data,
+            }
+            await aset_offer_list_page(key, page)
+            cache_status = 'MISS'
+        else:
+            cache_status = 'HIT'
+
+        response = get_conditional_response(request, etag=page['etag'])
+        if response is None:
+            response = Response(page['data'])
+        response['ETag'] = page['etag']
+        response['X-Cache'] = cache_status
+        return response
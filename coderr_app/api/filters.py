@@ -1,5 +1,8 @@
 from  django_filters import FilterSet, NumberFilter
-from coderr_app.models import Offer, Review
+from django.db.models import Exists, OuterRef
+from rest_framework.filters import BaseFilterBackend
+from coderr_app.models import Offer, OfferDetail, Review
+from coderr_app.search import search_offers
 
 class OfferFilter(FilterSet):
     creator_id = NumberFilter(field_name='user__id')
@@ -12,7 +15,9 @@ class OfferFilter(FilterSet):
 
     def filter_min_price(self, queryset, name, value):
         """
-        Filter offers by minimum price.
+        Filter offers that have at least one detail priced at or above the given value.
+
+        Uses an EXISTS subquery so the offer rows are neither joined nor deduplicated.
 
         Args:
             queryset (QuerySet): The queryset to filter.
@@ -20,13 +25,17 @@ class OfferFilter(FilterSet):
             value (float): The minimum price value.
 
         Returns:
-            QuerySet: The filtered queryset with distinct results.
+            QuerySet: The filtered queryset.
         """
-        return queryset.filter(details__price__gte=value).distinct()
+        details = OfferDetail.objects.filter(offer=OuterRef('pk'), price__gte=value)
+        return queryset.filter(Exists(details))
 
     def filter_max_delivery_time(self, queryset, name, value):
         """
-        Filter offers by maximum delivery time.
+        Filter offers that have at least one detail deliverable within the given days.
+
+        An offer has such a detail exactly when its precomputed minimum delivery
+        time is within the limit, so the indexed column is used directly.
 
         Args:
             queryset (QuerySet): The queryset to filter.
@@ -34,9 +43,9 @@ class OfferFilter(FilterSet):
             value (int): The maximum delivery time in days.
 
         Returns:
-            QuerySet: The filtered queryset with distinct results.
+            QuerySet: The filtered queryset.
         """
-        return queryset.filter(details__delivery_time_in_days__lte=value).distinct()
+        return queryset.filter(min_delivery_time__lte=value)
 
 class ReviewFilter(FilterSet):
     business_user_id = NumberFilter(field_name="business_user__id")
@@ -45,3 +54,23 @@ class ReviewFilter(FilterSet):
     class Meta:
         model = Review
         fields = ["business_user_id", "reviewer_id"]
+
+
+class OfferSearchFilter(BaseFilterBackend):
+    """
+    Full-text search on the offer title and description through the search index.
+
+    Replaces ``SearchFilter``'s ``icontains`` scans. Must run after the other
+    filter backends: the matches are intersected with the already filtered
+    queryset and, unless an explicit ``ordering`` was requested, sorted by
+    relevance with the current ordering as tie breaker.
+    """
+    search_param = 'search'
+    ordering_param = 'ordering'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        queryset = search_offers(queryset, query)
+        if 'search_rank' in queryset.query.annotations and not request.query_params.get(self.ordering_param):
+            queryset = queryset.order_by('search_rank', *queryset.query.order_by)
+        return queryset
@@ -1,8 +1,237 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+from datetime import datetime
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class OfferPagination(PageNumberPagination):
+    """
+    Page number pagination for offers.
+
+    Passing ``count=false`` skips the ``COUNT(*)`` query: one extra row is
+    fetched to find out whether a next page exists and ``count`` is returned as null.
+    """
     page_size = 6
     page_size_query_param = 'page_size'
     max_page_size = 10
-    
\ No newline at end of file
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.skip_count = request.query_params.get(self.count_query_param, '').lower() in ('false', '0')
+        if not self.skip_count:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        rows = list(self.get_uncounted_slice(queryset, request, page_size))
+        return self.finish_uncounted_page(rows, page_size)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of ``paginate_queryset`` for async views, using the async ORM.
+        """
+        self.skip_count = request.query_params.get(self.count_query_param, '').lower() in ('false', '0')
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        if self.skip_count:
+            rows = [obj async for obj in self.get_uncounted_slice(queryset, request, page_size)]
+            return self.finish_uncounted_page(rows, page_size)
+
+        self.request = request
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        if page_number in self.last_page_strings:
+            page_number = paginator.num_pages
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        offset = (number - 1) * page_size
+        rows = [obj async for obj in queryset[offset:offset + page_size]]
+        self.page = Page(rows, number, paginator)
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return rows
+
+    def get_uncounted_slice(self, queryset, request, page_size):
+        """
+        Return the slice of the requested page plus one row, without counting.
+
+        Raises:
+            NotFound: If the page number is invalid.
+        """
+        try:
+            page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound('Invalid page.')
+        if page_number < 1:
+            raise NotFound('Invalid page.')
+
+        self.request = request
+        self.page_number = page_number
+        offset = (page_number - 1) * page_size
+        return queryset[offset:offset + page_size + 1]
+
+    def finish_uncounted_page(self, rows, page_size):
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if not self.skip_count:
+            return super().get_paginated_response(data)
+        return Response({
+            'count': None,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.skip_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if not self.skip_count:
+            return super().get_previous_link()
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+
+class ListPagination(OfferPagination):
+    """
+    Default page number pagination for the order and review listings.
+    """
+    page_size = 20
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination on ``(updated_at, id)``, newest first.
+
+    Every page is a single indexed range query regardless of its depth and
+    no total count is computed. The cursor of the next page encodes the
+    ``updated_at`` and ``id`` of the last row of the current page.
+    Subclasses may page on another timestamp by setting ``cursor_field``.
+    """
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    cursor_field = 'updated_at'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size < 1:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, obj):
+        """
+        Encode the position of the given row into an opaque cursor string.
+        """
+        position = f'{getattr(obj, self.cursor_field).isoformat()}|{obj.pk}'
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        """
+        Decode a cursor string into its ``(cursor_field, id)`` position.
+
+        Raises:
+            NotFound: If the cursor is malformed.
+        """
+        try:
+            updated_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            return datetime.fromisoformat(updated_at), int(pk)
+        except (ValueError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor.')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        rows = list(self.get_page_slice(queryset, request, page_size))
+        return self.finish_page(rows, page_size)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of ``paginate_queryset`` for async views, using the async ORM.
+        """
+        page_size = self.get_page_size(request)
+        rows = [obj async for obj in self.get_page_slice(queryset, request, page_size)]
+        return self.finish_page(rows, page_size)
+
+    def get_page_slice(self, queryset, request, page_size):
+        """
+        Return the rows after the cursor position plus one, newest first.
+        """
+        self.request = request
+        queryset = queryset.order_by(f'-{self.cursor_field}', '-pk')
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            position, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(**{f'{self.cursor_field}__lt': position}) | Q(**{self.cursor_field: position, 'pk__lt': pk})
+            )
+        return queryset[:page_size + 1]
+
+    def finish_page(self, rows, page_size):
+        self.next_cursor = self.encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+
+class OfferKeysetPagination(KeysetPagination):
+    page_size = OfferPagination.page_size
+    max_page_size = OfferPagination.max_page_size
+
+
+class PaginationModeMixin:
+    """
+    Viewset mixin that switches to keyset pagination with ``?pagination=cursor``.
+
+    Without the parameter the viewset's ``pagination_class`` is used.
+    """
+    pagination_mode_query_param = 'pagination'
+    keyset_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            mode = self.request.query_params.get(self.pagination_mode_query_param)
+            if mode == 'cursor':
+                self._paginator = self.keyset_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
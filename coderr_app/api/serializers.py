@@ -1,6 +1,11 @@
+from collections import Counter
+from types import SimpleNamespace
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from coderr_app.models import Offer, OfferDetail, Order, Review
+from django.db import transaction
+from coderr_app.bulk import build_offer
+from coderr_app.images import variant_url
+from coderr_app.models import Offer, OfferDetail, Order, OrderCount, Review
 
 
 class UserDetailSerialiser(serializers.ModelSerializer):
@@ -61,18 +66,48 @@ class OfferSerializer(serializers.ModelSerializer):
         return attrs
     
     def create(self, validated_data):
-        request = self.context['request']
-        details_data = validated_data.pop('details')
-        offer = Offer.objects.create(user=request.user,  **validated_data)
+        """
+        Create the offer and its details in one transaction.
 
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data )
+        The details are inserted with a single ``bulk_create``.
+
+        Args:
+            validated_data (dict): The validated offer data including its details.
 
+        Returns:
+            Offer: The created offer.
+        """
+        request = self.context['request']
+        offer, details = build_offer(request.user, validated_data)
+        with transaction.atomic():
+            offer.save()
+            OfferDetail.objects.bulk_create(details)
         return offer
 
 
+class TemplatedHyperlinkedIdentityField(serializers.HyperlinkedIdentityField):
+    """
+    HyperlinkedIdentityField that reverses the URL only once per request.
+
+    The URL is reversed for a placeholder key and then formatted for every
+    object, instead of resolving the URL pattern again for each row.
+    """
+    placeholder = 9876543210
+
+    def get_url(self, obj, view_name, request, format):
+        lookup_value = getattr(obj, self.lookup_field)
+        if lookup_value in (None, ''):
+            return None
+        cache_key = (id(request), format)
+        if getattr(self, '_url_template_key', None) != cache_key:
+            placeholder = SimpleNamespace(**{self.lookup_field: self.placeholder})
+            self._url_template = super().get_url(placeholder, view_name, request, format)
+            self._url_template_key = cache_key
+        return self._url_template.replace(str(self.placeholder), str(lookup_value))
+
+
 class OfferDetailLinkSerializer(serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='offerdetail-detail')
+    url = TemplatedHyperlinkedIdentityField(view_name='offerdetail-detail')
 
     class Meta:
         model = OfferDetail
@@ -84,6 +119,7 @@ class OfferListSerializer(serializers.ModelSerializer):
         read_only=True
     )
 
+    image = serializers.SerializerMethodField()
     min_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     min_delivery_time = serializers.IntegerField(read_only=True)
     user_details = UserDetailSerialiser(source = 'user', read_only = True)
@@ -92,6 +128,20 @@ class OfferListSerializer(serializers.ModelSerializer):
         model = Offer
         fields = [ 'id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details' ]
 
+    def get_image(self, obj):
+        """
+        Get the URL of the list-sized WebP variant of the offer image.
+
+        Detail views keep serving the original.
+
+        Args:
+            obj (Offer): The Offer instance.
+
+        Returns:
+            str: The variant URL (the original if no variant exists), or None without image.
+        """
+        return variant_url(obj.image, obj.image_variants, 'medium', self.context.get('request'))
+
 
 class OfferUpdateSerializer(serializers.ModelSerializer):
     details = OfferDetailUpdateSerializer(many=True, required=False)
@@ -122,29 +172,57 @@ class OfferUpdateSerializer(serializers.ModelSerializer):
         return value
         
     def update(self, instance, validated_data):
-        details_data = validated_data.pop('details', None)
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-        
-        if details_data:
-            for detail_data in details_data:
-                offer_type = detail_data.get('offer_type')
-                
-                if not offer_type:
-                    raise serializers.ValidationError('offer_type is required to update an offer detail.')
-                
-                try:
-                    detail = instance.details.get(offer_type = offer_type)
-                except OfferDetail.DoesNotExist:
-                    raise serializers.ValidationError(f'Offer detail with type {offer_type} not found.')
-                
-                
-                for attr, value in detail_data.items():
-                    if attr != 'offer_type':
-                        setattr(detail, attr, value)
-                
-                detail.save()
+        """
+        Update the offer and the submitted tiers.
+
+        All tiers are read once (from the prefetch cache when available), changes are
+        applied in memory and written in one transaction: the changed tiers with a single
+        ``bulk_update`` and the offer with ``update_fields`` limited to the changed columns.
+
+        Args:
+            instance (Offer): The offer to update.
+            validated_data (dict): The validated data.
+
+        Returns:
+            Offer: The updated offer.
+
+        Raises:
+            ValidationError: If a tier has no offer_type or does not exist.
+        """
+        details_data = validated_data.pop('details', None) or []
+        details_by_type = {detail.offer_type: detail for detail in instance.details.all()}
+        changed_details = {}
+        changed_detail_fields = set()
+
+        for detail_data in details_data:
+            offer_type = detail_data.get('offer_type')
+            if not offer_type:
+                raise serializers.ValidationError('offer_type is required to update an offer detail.')
+            detail = details_by_type.get(offer_type)
+            if detail is None:
+                raise serializers.ValidationError(f'Offer detail with type {offer_type} not found.')
+
+            for attr, value in detail_data.items():
+                if attr != 'offer_type' and getattr(detail, attr) != value:
+                    setattr(detail, attr, value)
+                    changed_details[detail.pk] = detail
+                    changed_detail_fields.add(attr)
+
+        update_fields = [attr for attr, value in validated_data.items() if getattr(instance, attr) != value]
+        for attr in update_fields:
+            setattr(instance, attr, validated_data[attr])
+        if 'image' in update_fields:
+            update_fields.append('image_variants')
+        if changed_details:
+            instance.min_price = min(detail.price for detail in details_by_type.values())
+            instance.min_delivery_time = min(detail.delivery_time_in_days for detail in details_by_type.values())
+            update_fields += ['min_price', 'min_delivery_time']
+
+        with transaction.atomic():
+            if changed_details:
+                OfferDetail.objects.bulk_update(changed_details.values(), sorted(changed_detail_fields))
+            if update_fields:
+                instance.save(update_fields=update_fields + ['updated_at'])
         return instance
         
     
@@ -162,25 +240,33 @@ class OfferDetailSerializer(serializers.ModelSerializer):
         """
         Get the minimum price from the offer details.
 
+        Uses the stored column and falls back to the prefetched details, so no query is run.
+
         Args:
             obj (Offer): The offer instance.
 
         Returns:
             float: The minimum price.
         """
-        return obj.details.order_by('price').values_list('price', flat=True ).first()
+        if obj.min_price is not None:
+            return obj.min_price
+        return min((detail.price for detail in obj.details.all()), default=None)
         
     def get_min_delivery_time(self, obj):
         """
         Get the minimum delivery time from the offer details.
 
+        Uses the stored column and falls back to the prefetched details, so no query is run.
+
         Args:
             obj (Offer): The offer instance.
 
         Returns:
             int: The minimum delivery time in days.
         """
-        return obj.details.order_by('delivery_time_in_days').values_list('delivery_time_in_days', flat=True).first()
+        if obj.min_delivery_time is not None:
+            return obj.min_delivery_time
+        return min((detail.delivery_time_in_days for detail in obj.details.all()), default=None)
 
 
 class OrderCreateSerializer(serializers.Serializer):
@@ -203,19 +289,93 @@ class OrderCreateSerializer(serializers.Serializer):
         request = self.context['request']
         detail = validated_data['offer_detail_id']
 
-        order = Order.objects.create(
-            offer_detail=detail,
-            customer_user=request.user,
-            business_user=detail.offer.user,
-            title=detail.title,
-            revisions=detail.revisions,
-            delivery_time_in_days=detail.delivery_time_in_days,
-            price=detail.price,
-            features=detail.features,
-            offer_type=detail.offer_type,
-        )
+        with transaction.atomic():
+            order = Order.objects.create(
+                offer_detail=detail,
+                customer_user=request.user,
+                business_user=detail.offer.user,
+                title=detail.title,
+                revisions=detail.revisions,
+                delivery_time_in_days=detail.delivery_time_in_days,
+                price=detail.price,
+                features=detail.features,
+                offer_type=detail.offer_type,
+            )
+            OrderCount.adjust(order.business_user_id, order.status, 1)
 
         return order
+
+
+class OrderBulkCreateSerializer(serializers.Serializer):
+    """
+    Serializer for placing several orders at once (cart checkout).
+
+    All offer details are loaded with a single ``id__in`` query. Unknown
+    details and the customer's own offers are reported per item, the valid
+    items are inserted with one ``bulk_create`` in a single transaction.
+    """
+    offer_detail_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=100)
+
+    def validate_offer_detail_ids(self, value):
+        """
+        Resolve every requested offer detail and check it can be ordered.
+
+        Args:
+            value (list): The requested offer detail ids.
+
+        Returns:
+            list: One ``(offer_detail_id, detail, error)`` tuple per requested item.
+        """
+        request = self.context['request']
+        details = OfferDetail.objects.select_related('offer').in_bulk(set(value))
+        items = []
+        for offer_detail_id in value:
+            detail = details.get(offer_detail_id)
+            if detail is None:
+                items.append((offer_detail_id, None, 'Offer detail does not exist.'))
+            elif detail.offer.user_id == request.user.id:
+                items.append((offer_detail_id, None, 'You cannot order your own offer.'))
+            else:
+                items.append((offer_detail_id, detail, None))
+        return items
+
+    def create(self, validated_data):
+        """
+        Insert the orders of all valid items and update the order counters.
+
+        Args:
+            validated_data (dict): The validated data.
+
+        Returns:
+            list: One result per requested item, holding either the created order or an error.
+        """
+        request = self.context['request']
+        results = []
+        orders = []
+        for offer_detail_id, detail, error in validated_data['offer_detail_ids']:
+            if error:
+                results.append({'offer_detail_id': offer_detail_id, 'error': error})
+                continue
+            order = Order(
+                offer_detail=detail,
+                customer_user=request.user,
+                business_user_id=detail.offer.user_id,
+                title=detail.title,
+                revisions=detail.revisions,
+                delivery_time_in_days=detail.delivery_time_in_days,
+                price=detail.price,
+                features=detail.features,
+                offer_type=detail.offer_type,
+            )
+            orders.append(order)
+            results.append({'offer_detail_id': offer_detail_id, 'order': order})
+
+        if orders:
+            with transaction.atomic():
+                Order.objects.bulk_create(orders)
+                for business_user_id, count in Counter(order.business_user_id for order in orders).items():
+                    OrderCount.adjust(business_user_id, 'in_progress', count)
+        return results
     
 class OrderSerializer(serializers.ModelSerializer):
     class Meta:
@@ -249,6 +409,25 @@ class OrderStatusUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('Invalid status.')
         return value
 
+    def update(self, instance, validated_data):
+        """
+        Update the order status and move the order between the status counters.
+
+        Args:
+            instance (Order): The order to update.
+            validated_data (dict): The validated data.
+
+        Returns:
+            Order: The updated order.
+        """
+        with transaction.atomic():
+            previous_status = Order.objects.select_for_update().values_list('status', flat=True).get(pk=instance.pk)
+            instance = super().update(instance, validated_data)
+            if instance.status != previous_status:
+                OrderCount.adjust(instance.business_user_id, previous_status, -1)
+                OrderCount.adjust(instance.business_user_id, instance.status, 1)
+        return instance
+
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -257,6 +436,11 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = [ 'id', 'business_user', 'reviewer', 'rating', 'description', 'created_at', 'updated_at' ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'reviewer']
         
+    def validate_rating(self, value):
+        if not 1 <= value <= 5:
+            raise serializers.ValidationError('Rating must be between 1 and 5.')
+        return value
+
     def validate_business_user(self, value):
         if getattr(value.profile, 'type', None) != 'business':
             raise serializers.ValidationError('You can only review business users.')
@@ -271,10 +455,15 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         request = self.context['request']
-        return Review.objects.create(reviewer=request.user, **validated_data)
+        with transaction.atomic():
+            return Review.objects.create(reviewer=request.user, **validated_data)
     
     def update(self, instance, validated_data):
-        instance.rating = validated_data.get('rating', instance.rating)
-        instance.description = validated_data.get('description', instance.description)
-        instance.save()
+        with transaction.atomic():
+            # Lock the review and delta the rating summary against the stored
+            # rating, so concurrent updates do not remove the same rating twice.
+            instance._loaded_rating = Review.objects.select_for_update().values_list('rating', flat=True).get(pk=instance.pk)
+            instance.rating = validated_data.get('rating', instance.rating)
+            instance.description = validated_data.get('description', instance.description)
+            instance.save()
         return instance
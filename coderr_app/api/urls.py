@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import  OfferModelViewSet, ReviewViewSet, OrderViewSet, BaseInfoView, OfferDetailView, OrderCountView, CompletedOrderCountView
+from .views import  OfferModelViewSet, ReviewViewSet, OrderViewSet, BaseInfoView, OfferDetailView, OrderCountView, CompletedOrderCountView, OrderStatusCountView
 
 router = DefaultRouter()
 router.register( r'offers', OfferModelViewSet, basename='offer')
@@ -13,5 +13,6 @@ urlpatterns = [
     path('offerdetails/<int:pk>/', OfferDetailView.as_view() ,name = 'offerdetail-detail'),
     path('order-count/<int:business_user_id>/', OrderCountView.as_view(), name = 'order-count'),
     path('completed-order-count/<int:business_user_id>/',CompletedOrderCountView.as_view(), name = 'completed-order-count'),
+    path('order-status-count/<int:business_user_id>/', OrderStatusCountView.as_view(), name = 'order-status-count'),
     
 ]
\ No newline at end of file
@@ -1,43 +1,60 @@
-from django.db.models import Q, Count, Avg, Min
-from django.contrib.auth.models import User
-from django.shortcuts import get_object_or_404
+import hashlib
+import json
+from django.conf import settings
+from django.db.models import OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.generics import RetrieveAPIView
+from rest_framework.decorators import action
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from auth_app.models import Profile
-from coderr_app.models import Offer, Review, OfferDetail, Order
-from .filters import OfferFilter, ReviewFilter
-from .limit_paginations import OfferPagination
-from .serializers import  OfferDetailSerializer, OfferUpdateSerializer, OrderCreateSerializer, OfferListSerializer, OfferSerializer, OrderSerializer, OrderStatusUpdateSerializer, ReviewSerializer, OfferDetailOrderSerializer
+from coderr_app.models import Offer, Review, OfferDetail, Order, OrderCount
+from coderr_app.bulk import bulk_create_offers
+from coderr_app.list_cache import get_offer_list_metrics
+from coderr_app.stats import aget_stats
+from coderr_app.suggest import title_index
+from .filters import OfferFilter, OfferSearchFilter, ReviewFilter
+from .async_views import AsyncAPIView, AsyncReadViewSetMixin
+from .caching import AnonymousListCacheMixin
+from .exports import StreamingExportMixin
+from .limit_paginations import ListPagination, OfferPagination, OfferKeysetPagination, PaginationModeMixin
+from .serializers import  OfferDetailSerializer, OfferUpdateSerializer, OrderBulkCreateSerializer, OrderCreateSerializer, OfferListSerializer, OfferSerializer, OrderSerializer, OrderStatusUpdateSerializer, ReviewSerializer, OfferDetailOrderSerializer
 from .permissions import IsAdminOrStaff, IsBusinessOrCustomerUser, IsBusinessUserOrOwnerOrReadOnly, IsBusinessUserOrder, IsCustomerReviewer, IsReviewOwnerOrReadOnly
 
 
-class OfferModelViewSet(ModelViewSet):
+class OfferModelViewSet(AnonymousListCacheMixin, PaginationModeMixin, AsyncReadViewSetMixin, ModelViewSet):
     """
     ViewSet for managing offers.
 
     Handles offer creation, listing, updating, and deletion with appropriate permissions.
-    Supports filtering, searching, and ordering.
+    Supports filtering, ranked full-text search, ordering and keyset pagination with ``?pagination=cursor``.
+    List pages served to anonymous users are cached until the next offer write.
+    List and retrieve are async and use the async ORM.
     """
-    queryset = Offer.objects.prefetch_related('details').annotate(min_price=Min('details__price'), min_delivery_time=Min('details__delivery_time_in_days'))
+    queryset = Offer.objects.select_related('user').prefetch_related('details')
     pagination_class = OfferPagination
-    filter_backends = [ DjangoFilterBackend, SearchFilter, OrderingFilter ]
+    keyset_pagination_class = OfferKeysetPagination
+    filter_backends = [ DjangoFilterBackend, OrderingFilter, OfferSearchFilter ]
     filterset_class = OfferFilter
-    search_fields = ['title', 'description' ]
     ordering_fields = [ 'updated_at',  'min_price' ]
     ordering = ['-updated_at']
+    max_bulk_offers = 1000
+    max_suggestions = 20
     
     def get_permissions(self):
-        if self.action == 'list':
+        if self.action in ['list', 'suggest']:
             return [AllowAny()]
         if self.action == 'retrieve':
             return [IsAuthenticated()]
-        if self.action == 'create':
+        if self.action in ['suggest_metrics', 'cache_metrics']:
+            return [IsAdminUser()]
+        if self.action in ['create', 'bulk_create']:
             return [IsAuthenticated(), IsBusinessUserOrOwnerOrReadOnly()]
         if self.action in ['partial_update', 'destroy']:
             return [IsAuthenticated(), IsBusinessUserOrOwnerOrReadOnly()]
@@ -54,12 +71,68 @@ class OfferModelViewSet(ModelViewSet):
             return OfferListSerializer
         if self.action == 'retrieve':
             return OfferDetailSerializer
-        if self.action == 'create':
+        if self.action in ['create', 'bulk_create']:
             return OfferSerializer
         if self.action == 'partial_update':
             return OfferUpdateSerializer
         return OfferDetailSerializer
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Create many offers, each with its three details, in batched transactions.
+
+        Expects a JSON list of offers in the same format as a single offer creation.
+
+        Args:
+            request (Request): The request with the list of offers.
+
+        Returns:
+            Response: The number and ids of the created offers with HTTP 201, or HTTP 400 on invalid data.
+        """
+        if not isinstance(request.data, list) or not request.data:
+            return Response({'detail': 'Expected a non-empty list of offers.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(request.data) > self.max_bulk_offers:
+            return Response({'detail': f'At most {self.max_bulk_offers} offers can be created at once.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        offers = bulk_create_offers(request.user, serializer.validated_data)
+        return Response({'created': len(offers), 'ids': [offer.id for offer in offers]}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path='suggest')
+    def suggest(self, request):
+        """
+        Suggest offer titles for a typed prefix from the in-process title index.
+
+        Query parameters: ``q`` (the prefix) and ``limit`` (default 10, at most 20).
+
+        Args:
+            request (Request): The request.
+
+        Returns:
+            Response: A list of suggestions with the offer 'id' and 'title'.
+        """
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), self.max_suggestions)
+        except ValueError:
+            limit = 10
+        return Response(title_index.suggest(request.query_params.get('q', ''), limit))
+
+    @action(detail=False, methods=['get'], url_path='suggest/metrics')
+    def suggest_metrics(self, request):
+        """
+        Report size and lookup latency of this worker's title suggestion index (admin users only).
+        """
+        return Response(title_index.metrics())
+
+    @action(detail=False, methods=['get'], url_path='cache/metrics')
+    def cache_metrics(self, request):
+        """
+        Report hits and misses of the anonymous offer list cache (admin users only).
+        """
+        return Response(get_offer_list_metrics())
+
 
 class OfferDetailView(RetrieveAPIView):
     """
@@ -72,19 +145,23 @@ class OfferDetailView(RetrieveAPIView):
     queryset = OfferDetail.objects.all()
     
 
-class OrderViewSet(ModelViewSet):
+class OrderViewSet(StreamingExportMixin, PaginationModeMixin, AsyncReadViewSetMixin, ModelViewSet):
     """
     ViewSet for managing orders.
 
     Handles order creation, listing, updating, and deletion with appropriate permissions.
+    Listings are paginated, support keyset pagination with ``?pagination=cursor``
+    and a streaming export of all matching orders with ``?export=stream``.
+    List and retrieve are async and use the async ORM.
     """
     serializer_class = OrderCreateSerializer
+    pagination_class = ListPagination
     
     def get_queryset(self):
         user  = self.request.user
         if self.action == 'destroy':
             return Order.objects.all()
-        return Order.objects.filter(Q(customer_user=user) | Q(business_user=user))
+        return Order.objects.filter(Q(customer_user=user) | Q(business_user=user)).order_by('-updated_at', '-id')
 
     def get_serializer_context(self):
         """
@@ -100,7 +177,7 @@ class OrderViewSet(ModelViewSet):
             return [IsBusinessOrCustomerUser(), IsAuthenticated()]
         if self.action == 'retrieve':
             return [IsAuthenticated(), IsBusinessUserOrOwnerOrReadOnly(), IsBusinessOrCustomerUser()]
-        if self.action == 'create':
+        if self.action in ['create', 'bulk_create']:
             return [IsAuthenticated(), IsCustomerReviewer()]
         if self.action == 'partial_update':
             return [IsAuthenticated(), IsBusinessOrCustomerUser()]
@@ -111,6 +188,8 @@ class OrderViewSet(ModelViewSet):
     def get_serializer_class(self):
         if self.action == 'create':
             return OrderCreateSerializer
+        if self.action == 'bulk_create':
+            return OrderBulkCreateSerializer
         if self.action == 'partial_update':
             return OrderStatusUpdateSerializer
         return OrderSerializer
@@ -121,6 +200,31 @@ class OrderViewSet(ModelViewSet):
         order = serializer.save()
         
         return Response( OrderSerializer(order).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Place several orders at once.
+
+        Args:
+            request (Request): The request with the list of ``offer_detail_ids``.
+
+        Returns:
+            Response: One result per requested item with HTTP 201 if at least one order
+            was created, otherwise HTTP 400.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = serializer.save()
+
+        data = []
+        for result in results:
+            if 'order' in result:
+                data.append({'offer_detail_id': result['offer_detail_id'], 'status': 'created', 'order': OrderSerializer(result['order']).data})
+            else:
+                data.append({'offer_detail_id': result['offer_detail_id'], 'status': 'error', 'detail': result['error']})
+        created = any('order' in result for result in results)
+        return Response({'results': data}, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
     
     def partial_update(self, request, *args, **kwargs):
         order = Order.objects.filter(id=kwargs['pk']).first()
@@ -133,9 +237,27 @@ class OrderViewSet(ModelViewSet):
         serialiser.is_valid(raise_exception=True)
         data = serialiser.save()
         return Response( OrderSerializer(data).data, status=status.HTTP_200_OK)
-    
 
-class OrderCountView(APIView):
+
+async def get_business_order_counts(business_user_id, statuses):
+    """
+    Read the order counters of a business user in a single query.
+
+    Args:
+        business_user_id (int): The id of the business user.
+        statuses (list): The order statuses to read.
+
+    Returns:
+        dict: The count per status, or None if the user is not a business user.
+    """
+    counters = {
+        order_status: Coalesce(Subquery(OrderCount.objects.filter(business_user=OuterRef('pk'), status=order_status).values('count')[:1]), 0)
+        for order_status in statuses
+    }
+    return await Profile.objects.filter(pk=business_user_id, type='business').values(**counters).afirst()
+
+
+class OrderCountView(AsyncAPIView):
     """
     API view to get the count of in-progress orders for a business user.
 
@@ -143,18 +265,15 @@ class OrderCountView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
-    def get(self, request, business_user_id):
-        user = get_object_or_404(User, id=business_user_id)
-
-        if not hasattr(user, 'profile') or user.profile.type != 'business':
+    async def get(self, request, business_user_id):
+        counts = await get_business_order_counts(business_user_id, ['in_progress'])
+        if counts is None:
             return Response({'detail': 'The user is not found or is not a business user.'},status=status.HTTP_404_NOT_FOUND)
-        
-        count = Order.objects.filter( business_user=user, status='in_progress').count()
 
-        return Response({'order_count': count}, status=status.HTTP_200_OK)
+        return Response({'order_count': counts['in_progress']}, status=status.HTTP_200_OK)
 
 
-class CompletedOrderCountView(APIView):
+class CompletedOrderCountView(AsyncAPIView):
     """
     API view to get the count of completed orders for a business user.
 
@@ -162,19 +281,41 @@ class CompletedOrderCountView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
-    def get(self, request, business_user_id):
-        user = get_object_or_404(User, id=business_user_id)
+    async def get(self, request, business_user_id):
+        counts = await get_business_order_counts(business_user_id, ['completed'])
+        if counts is None:
+            return Response({'detail': 'The user is not found or is not a business user.'},status=status.HTTP_404_NOT_FOUND)
+
+        return Response({'completed_order_count': counts['completed']}, status=status.HTTP_200_OK)
+
+
+class OrderStatusCountView(AsyncAPIView):
+    """
+    API view to get the order count of every status for a business user.
 
-        if not hasattr(user, 'profile') or user.profile.type != 'business':
+    Requires authentication.
+    """
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request, business_user_id):
+        statuses = [choice for choice, label in Order.STATUS_CHOICES]
+        counts = await get_business_order_counts(business_user_id, statuses)
+        if counts is None:
             return Response({'detail': 'The user is not found or is not a business user.'},status=status.HTTP_404_NOT_FOUND)
-        
-        count = Order.objects.filter( business_user=user, status='completed').count()
 
-        return Response({'completed_order_count': count}, status=status.HTTP_200_OK)
+        return Response(counts, status=status.HTTP_200_OK)
 
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(StreamingExportMixin, PaginationModeMixin, AsyncReadViewSetMixin, ModelViewSet):
+    """
+    ViewSet for managing reviews.
+
+    Supports filtering, ordering, paginated listings, keyset pagination with
+    ``?pagination=cursor`` and a streaming export with ``?export=stream``.
+    List and retrieve are async and use the async ORM.
+    """
     queryset = Review.objects.all()
+    pagination_class = ListPagination
     permission_classes = [IsCustomerReviewer, IsReviewOwnerOrReadOnly, IsAuthenticated]
     serializer_class = ReviewSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
@@ -183,7 +324,7 @@ class ReviewViewSet(ModelViewSet):
     ordering = ["-updated_at"]
 
 
-class BaseInfoView(APIView):
+class BaseInfoView(AsyncAPIView):
     """
     API view to get basic information about the platform.
 
@@ -192,7 +333,7 @@ class BaseInfoView(APIView):
     """
     permission_classes = [AllowAny]
 
-    def get(self, request):
+    async def get(self, request):
         """Handle GET request and return platform statistics.
          Statistics returned:
         - review_count (int): Total number of reviews.
@@ -200,23 +341,26 @@ class BaseInfoView(APIView):
         - business_profile_count (int): Number of profiles with type 'business'.
         - offer_count (int): Total number of offers.
 
+        The counters are served from the cache (see ``coderr_app.stats``). The response
+        carries an ETag and answers conditional requests with 304 Not Modified.
+
         Args:
             request (HttpRequest): The incoming HTTP request object.
 
         Returns:
             Response: statatistics data with HTTP 200 OK status.
         """
+        stats = await aget_stats()
         data = {}
-        review_stats = Review.objects.aggregate(review_count = Count('id'), average_rating = Avg('rating'))
-        data['review_count'] = review_stats['review_count']
-        data['average_rating'] = (round(review_stats['average_rating'], 1) if review_stats['average_rating'] is not None else 0)
-        
-        data['business_profile_count'] = Profile.objects.filter(type = 'business').count()
-        data['offer_count'] = Offer.objects.count()
-        return Response(data, status=status.HTTP_200_OK)
-        
-    
-    
-    
-    
-    
+        data['review_count'] = stats['review_count']
+        data['average_rating'] = (round(stats['rating_sum'] / stats['review_count'], 1) if stats['review_count'] else 0)
+        data['business_profile_count'] = stats['business_profile_count']
+        data['offer_count'] = stats['offer_count']
+
+        etag = quote_etag(hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest())
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(data, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.BASE_INFO_MAX_AGE)
+        return response
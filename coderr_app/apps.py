@@ -8,3 +8,11 @@ class CoderrAppConfig(AppConfig):
     This app handles offers, orders, and reviews for a marketplace platform.
     """
     name = 'coderr_app'
+
+    def ready(self):
+        """
+        Method called when the app is ready.
+
+        Imports the signals module to register signal handlers.
+        """
+        import coderr_app.signals
@@ -0,0 +1,65 @@
+from django.db import transaction
+from coderr_app.list_cache import bump_offer_list_version
+from coderr_app.models import Offer, OfferDetail
+from coderr_app.search import enqueue_reindex
+from coderr_app.stats import adjust_stats
+from coderr_app.suggest import offer_titles_changed
+
+
+def build_offer(user, offer_data):
+    """
+    Build an unsaved offer and its unsaved details from validated data.
+
+    Args:
+        user (User): The business user owning the offer.
+        offer_data (dict): Validated offer data including its 'details'.
+
+    Returns:
+        tuple: The Offer instance and the list of OfferDetail instances.
+    """
+    offer_data = dict(offer_data)
+    details_data = offer_data.pop('details')
+    offer = Offer(
+        user=user,
+        min_price=min(detail['price'] for detail in details_data),
+        min_delivery_time=min(detail['delivery_time_in_days'] for detail in details_data),
+        **offer_data
+    )
+    details = [OfferDetail(offer=offer, **detail_data) for detail_data in details_data]
+    return offer, details
+
+
+def bulk_create_offers(user, offers_data, batch_size=500):
+    """
+    Create many offers with their details in batched transactions.
+
+    Every batch is inserted with two ``bulk_create`` statements (offers, then
+    details) inside its own transaction. ``bulk_create`` sends no signals, so
+    the search indexing is enqueued and the offer list cache and the platform
+    statistics are updated per batch.
+
+    Args:
+        user (User): The business user owning the offers.
+        offers_data (list): Validated offer data, each including its 'details'.
+        batch_size (int): The number of offers per transaction.
+
+    Returns:
+        list: The created offers.
+    """
+    created = []
+    for start in range(0, len(offers_data), batch_size):
+        offers, details = [], []
+        for offer_data in offers_data[start:start + batch_size]:
+            offer, offer_details = build_offer(user, offer_data)
+            offers.append(offer)
+            details.extend(offer_details)
+
+        with transaction.atomic():
+            Offer.objects.bulk_create(offers)
+            OfferDetail.objects.bulk_create(details)
+            enqueue_reindex([offer.pk for offer in offers])
+            offer_titles_changed(offers)
+            bump_offer_list_version()
+            adjust_stats(offer_count=len(offers))
+        created.extend(offers)
+    return created
@@ -0,0 +1,195 @@
+import os
+import posixpath
+from io import BytesIO
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+from coderr_app.jobs import enqueue, job
+
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 90, 'optimize': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 90},
+}
+
+
+def encode(image, image_format, **options):
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def webp_ready(image):
+    """
+    Convert an image to a mode WebP can store, keeping transparency.
+    """
+    if image.mode in ('RGB', 'RGBA'):
+        return image
+    has_alpha = image.mode in ('LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def process_stored_image(field_file):
+    """
+    Strip the metadata of a stored image and store its WebP variants.
+
+    The EXIF orientation is applied to the pixels first, then the original is
+    re-encoded in its own format without EXIF, XMP or text chunks (the colour
+    profile is kept) and stored as a new file that ``field_file`` points to
+    afterwards. Every size of ``IMAGE_VARIANT_SIZES`` is stored as a WebP image
+    whose longest edge is at most that many pixels. Animated images keep their
+    original bytes.
+
+    Args:
+        field_file (ImageFieldFile): The committed image of an instance.
+
+    Returns:
+        dict: The storage name per variant, empty if the file is not a readable image.
+    """
+    storage = field_file.storage
+    with storage.open(field_file.name) as stored:
+        data = stored.read()
+    try:
+        source = Image.open(BytesIO(data))
+        source.load()
+    except (OSError, Image.DecompressionBombError):
+        return {}
+
+    upload_name = os.path.basename(field_file.name)
+    stem = os.path.splitext(upload_name)[0]
+    image_format = source.format
+    icc_profile = source.info.get('icc_profile')
+    image = ImageOps.exif_transpose(source)
+
+    if not getattr(source, 'is_animated', False):
+        options = dict(SAVE_OPTIONS.get(image_format, {}))
+        if icc_profile:
+            options['icc_profile'] = icc_profile
+        try:
+            stripped = encode(image, image_format, **options)
+        except (OSError, KeyError, ValueError):
+            stripped = None
+        if stripped is not None:
+            field_file.save(upload_name, ContentFile(stripped), save=False)
+
+    directory = posixpath.join(field_file.field.upload_to.rstrip('/'), 'variants')
+    variants = {}
+    for variant, size in settings.IMAGE_VARIANT_SIZES.items():
+        resized = webp_ready(image.copy())
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        content = ContentFile(encode(resized, 'WEBP', quality=settings.IMAGE_WEBP_QUALITY, method=4))
+        variants[variant] = storage.save(posixpath.join(directory, f'{stem}.{variant}.webp'), content)
+    source.close()
+    return variants
+
+
+def delete_files_on_commit(storage, names):
+    """
+    Delete the given files from the storage once the current transaction commits.
+    """
+    names = [name for name in names if name]
+    if names:
+        transaction.on_commit(lambda: [storage.delete(name) for name in names])
+
+
+def reset_image_variants(field_file, variants):
+    """
+    Return the variants matching the current state of an image field before it is saved.
+
+    If the image was replaced or cleared, the previous variants are dropped
+    and their files deleted once the transaction commits; the variants of a
+    new upload are generated later by the ``images.process`` job.
+
+    Args:
+        field_file (ImageFieldFile): The image field of the instance being saved.
+        variants (dict): The variants currently stored on the instance.
+
+    Returns:
+        dict: The variants to store.
+    """
+    if field_file and field_file._committed:
+        return variants
+    delete_files_on_commit(field_file.storage, (variants or {}).values())
+    return {}
+
+
+def is_new_upload(field_file):
+    """
+    Return whether an image field holds an upload that has not been stored yet.
+    """
+    return bool(field_file) and not field_file._committed
+
+
+def enqueue_image_processing(instance, field, variants_field):
+    """
+    Enqueue the ``images.process`` job for the image field of a saved instance.
+
+    Args:
+        instance (Model): The saved model instance.
+        field (str): The name of the image field.
+        variants_field (str): The name of the JSON field storing the variants.
+    """
+    model = instance._meta.label_lower
+    enqueue(
+        'images.process',
+        {'model': model, 'pk': instance.pk, 'field': field, 'variants_field': variants_field},
+        idempotency_key=f'images:{model}:{instance.pk}:{field}',
+    )
+
+
+@job('images.process')
+def process_image(model, pk, field, variants_field):
+    """
+    Job handler that strips the current image of an instance and stores its variants.
+
+    The image is processed outside of any row lock. The result is only saved
+    if the instance still holds the same unprocessed image, otherwise the new
+    files are discarded; the replaced original is deleted after the commit.
+
+    Args:
+        model (str): The model label, e.g. 'coderr_app.offer'.
+        pk (int): The primary key of the instance.
+        field (str): The name of the image field.
+        variants_field (str): The name of the JSON field storing the variants.
+    """
+    model_class = apps.get_model(model)
+    instance = model_class.objects.filter(pk=pk).first()
+    if instance is None or not getattr(instance, field) or getattr(instance, variants_field):
+        return
+
+    field_file = getattr(instance, field)
+    original = field_file.name
+    variants = process_stored_image(field_file)
+    created = [name for name in [field_file.name, *variants.values()] if name != original]
+
+    current = model_class.objects.select_for_update().filter(pk=pk).values(field, variants_field).first()
+    if current is None or current[field] != original or current[variants_field]:
+        delete_files_on_commit(field_file.storage, created)
+        return
+
+    setattr(instance, variants_field, variants)
+    instance.save(update_fields=[field, variants_field])
+    if field_file.name != original:
+        delete_files_on_commit(field_file.storage, [original])
+
+
+def variant_url(field_file, variants, variant, request=None):
+    """
+    Return the URL of an image variant, falling back to the original.
+
+    Args:
+        field_file (ImageFieldFile): The original image.
+        variants (dict): The stored variants of the image.
+        variant (str): The wanted variant, a key of ``IMAGE_VARIANT_SIZES``.
+        request (Request): Used to build an absolute URL, if given.
+
+    Returns:
+        str: The URL, or None if there is no image.
+    """
+    if not field_file:
+        return None
+    name = (variants or {}).get(variant)
+    url = field_file.storage.url(name) if name else field_file.url
+    return request.build_absolute_uri(url) if request is not None else url
@@ -0,0 +1,223 @@
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from coderr_app.models import Job
+
+handlers = {}
+
+
+def job(name):
+    """
+    Register a function as the handler of the jobs with the given name.
+
+    The handler is called with the job's payload as keyword arguments inside
+    a transaction; raising an exception schedules a retry.
+
+    Args:
+        name (str): The name jobs are enqueued with, e.g. 'images.process'.
+
+    Returns:
+        callable: A decorator returning the function unchanged.
+    """
+    def decorator(func):
+        handlers[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, idempotency_key=None, delay=0, max_attempts=None):
+    """
+    Add a job to the queue as part of the current transaction.
+
+    The job only becomes visible to the workers once the transaction commits
+    and is dropped if it rolls back. If a job with the same idempotency key
+    is still pending, no new job is added; the pending one takes the new
+    payload instead. That update locks it, so a worker cannot claim it before
+    the current transaction commits and the job is run against the new data.
+    If a worker claimed it first, a new pending job is added.
+
+    Args:
+        name (str): The registered handler name.
+        payload (dict): JSON-serializable keyword arguments for the handler.
+        idempotency_key (str): Optional key identifying the work to deduplicate.
+        delay (int): Seconds before the job may start.
+        max_attempts (int): Attempts before the job is marked as failed, defaults to ``JOB_MAX_ATTEMPTS``.
+
+    Raises:
+        ValueError: If no handler is registered under the name.
+    """
+    if name not in handlers:
+        raise ValueError(f'No job handler is registered as {name!r}.')
+    new_job = Job(
+        name=name,
+        payload=payload or {},
+        idempotency_key=idempotency_key,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    if idempotency_key is None:
+        Job.objects.bulk_create([new_job])
+        return
+    pending = Job.objects.filter(idempotency_key=idempotency_key, status='pending')
+    while True:
+        Job.objects.bulk_create([new_job], ignore_conflicts=True)
+        # Matches the inserted job or the pending one it conflicted with; no
+        # match means that one was claimed in the meantime.
+        if pending.update(payload=new_job.payload):
+            return
+
+
+def claimable():
+    """
+    Return the filter for jobs a worker may start: pending jobs that are due
+    and running jobs whose worker has not finished them within ``JOB_LOCK_TIMEOUT``.
+    """
+    now = timezone.now()
+    return Q(status='pending', run_after__lte=now) | Q(status='running', locked_at__lt=now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT))
+
+
+def claim_jobs(worker_name, limit):
+    """
+    Claim up to ``limit`` due jobs for a worker.
+
+    Every candidate is claimed with a conditional ``UPDATE``, so concurrent
+    workers never start the same job, on SQLite as well as on PostgreSQL.
+
+    Args:
+        worker_name (str): The name recorded as ``locked_by``.
+        limit (int): The maximum number of jobs to claim.
+
+    Returns:
+        list: The claimed Job instances, oldest first.
+    """
+    candidates = Job.objects.filter(claimable()).order_by('run_after', 'pk').values_list('pk', flat=True)[:limit]
+    claimed = [
+        pk for pk in list(candidates)
+        if Job.objects.filter(claimable(), pk=pk).update(
+            status='running', locked_by=worker_name, locked_at=timezone.now(), attempts=F('attempts') + 1,
+        )
+    ]
+    return list(Job.objects.filter(pk__in=claimed, locked_by=worker_name).order_by('run_after', 'pk'))
+
+
+def run_job(claimed_job):
+    """
+    Run a claimed job and record its outcome.
+
+    A finished job is deleted. A failed job is retried after
+    ``JOB_RETRY_DELAY`` seconds, doubled with every attempt, until it
+    reaches its ``max_attempts`` and is kept with the status 'failed'.
+
+    Args:
+        claimed_job (Job): A job claimed by ``claim_jobs``.
+
+    Returns:
+        bool: Whether the job succeeded.
+    """
+    try:
+        handler = handlers.get(claimed_job.name)
+        if handler is None:
+            raise LookupError(f'No job handler is registered as {claimed_job.name!r}.')
+        with transaction.atomic():
+            handler(**claimed_job.payload)
+    except Exception:
+        fail_job(claimed_job, traceback.format_exc())
+        return False
+    Job.objects.filter(pk=claimed_job.pk, locked_by=claimed_job.locked_by).delete()
+    return True
+
+
+def fail_job(claimed_job, error):
+    """
+    Schedule the retry of a failed job or mark it as failed.
+
+    If a newer job with the same idempotency key is already pending, the
+    failed job is dropped instead of retried, since the pending one covers it.
+    """
+    unlocked = Job.objects.filter(pk=claimed_job.pk, locked_by=claimed_job.locked_by)
+    if claimed_job.attempts >= claimed_job.max_attempts:
+        unlocked.update(status='failed', last_error=error, locked_by='', locked_at=None)
+        return
+
+    delay = settings.JOB_RETRY_DELAY * 2 ** (claimed_job.attempts - 1)
+    try:
+        with transaction.atomic():
+            unlocked.update(
+                status='pending', run_after=timezone.now() + timedelta(seconds=delay),
+                last_error=error, locked_by='', locked_at=None,
+            )
+    except IntegrityError:
+        unlocked.delete()
+
+
+class Worker:
+    """
+    Runs queued jobs in the current process until stopped.
+
+    Jobs are claimed in batches; when none are due the worker sleeps for
+    ``poll_interval`` seconds. ``stop`` lets the current job finish first.
+    """
+
+    def __init__(self, name=None, batch_size=10, poll_interval=None):
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.batch_size = batch_size
+        self.poll_interval = settings.JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.stopped = False
+        self.succeeded = 0
+        self.failed = 0
+
+    def stop(self, *args):
+        self.stopped = True
+
+    def run_batch(self):
+        """
+        Claim and run one batch of due jobs.
+
+        Returns:
+            int: The number of jobs run.
+        """
+        jobs = claim_jobs(self.name, self.batch_size)
+        for index, claimed_job in enumerate(jobs):
+            if self.stopped:
+                # Hand the rest of the batch back without counting an attempt.
+                Job.objects.filter(pk__in=[other.pk for other in jobs[index:]], locked_by=self.name).update(
+                    status='pending', locked_by='', locked_at=None, attempts=F('attempts') - 1,
+                )
+                return index
+            if run_job(claimed_job):
+                self.succeeded += 1
+            else:
+                self.failed += 1
+        return len(jobs)
+
+    def run(self, until_empty=False):
+        """
+        Run jobs until ``stop`` is called, or until no job is due with ``until_empty``.
+
+        Returns:
+            tuple: The number of succeeded and failed jobs.
+        """
+        while not self.stopped:
+            if not until_empty:
+                # Like a request, every batch of a long-running worker starts
+                # with fresh or reusable connections according to CONN_MAX_AGE.
+                close_old_connections()
+            if self.run_batch():
+                continue
+            if until_empty:
+                break
+            time.sleep(self.poll_interval)
+        return self.succeeded, self.failed
+
+
+def run_pending_jobs():
+    """
+    Run all due jobs in the current process and return the succeeded and failed counts.
+    """
+    return Worker().run(until_empty=True)
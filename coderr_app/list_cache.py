@@ -0,0 +1,130 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+OFFER_LIST_KEY_PREFIX = 'offer-list:'
+OFFER_LIST_VERSION_KEY = OFFER_LIST_KEY_PREFIX + 'version'
+OFFER_LIST_COUNTER_FIELDS = ['hits', 'misses']
+PROCESS_LOCAL_CACHE_BACKENDS = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+def cache_is_shared():
+    """
+    Return whether the default cache is shared by all processes of the deployment.
+
+    The version bumps, cached pages and counters of this module only reach
+    the other gunicorn workers and the ``run_jobs`` workers through a shared
+    cache (see ``CACHE_BACKEND``); a process-local cache is only correct for
+    a single process.
+    """
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHE_BACKENDS
+
+
+def get_offer_list_version():
+    """
+    Return the current version of the cached anonymous offer list pages.
+
+    Returns:
+        int: The version; entries of older versions are never read again.
+    """
+    version = cache.get(OFFER_LIST_VERSION_KEY)
+    if version is None:
+        cache.add(OFFER_LIST_VERSION_KEY, 1, None)
+        version = cache.get(OFFER_LIST_VERSION_KEY, 1)
+    return version
+
+
+async def aget_offer_list_version():
+    """
+    Async counterpart of ``get_offer_list_version``.
+
+    Returns:
+        int: The version; entries of older versions are never read again.
+    """
+    version = await cache.aget(OFFER_LIST_VERSION_KEY)
+    if version is None:
+        await cache.aadd(OFFER_LIST_VERSION_KEY, 1, None)
+        version = await cache.aget(OFFER_LIST_VERSION_KEY, 1)
+    return version
+
+
+def _bump_version():
+    try:
+        cache.incr(OFFER_LIST_VERSION_KEY)
+    except ValueError:
+        cache.add(OFFER_LIST_VERSION_KEY, 1, None)
+
+
+def bump_offer_list_version():
+    """
+    Invalidate all cached anonymous offer list pages.
+
+    The version is bumped right away and again once the current transaction
+    commits, so a page rendered from uncommitted or pre-commit data is never
+    served after the commit.
+    """
+    _bump_version()
+    transaction.on_commit(_bump_version)
+
+
+def offer_list_cache_key(version, host, params):
+    """
+    Build the cache key of an offer list page.
+
+    Args:
+        version (int): The current offer list version.
+        host (str): The request host, which appears in the pagination links.
+        params (QueryDict): The query parameters of the request.
+
+    Returns:
+        str: The cache key for the normalized (sorted) query string.
+    """
+    normalized = '&'.join(f'{key}={value}' for key, values in sorted(params.lists()) for value in sorted(values))
+    digest = hashlib.md5(f'{host}?{normalized}'.encode()).hexdigest()
+    return f'{OFFER_LIST_KEY_PREFIX}{version}:{digest}'
+
+
+async def aget_offer_list_page(key):
+    return await cache.aget(key)
+
+
+async def aset_offer_list_page(key, page):
+    await cache.aset(key, page, settings.OFFER_LIST_CACHE_TIMEOUT)
+
+
+async def acount_offer_list_lookup(hit):
+    """
+    Count a cache hit or miss of the anonymous offer list.
+
+    Args:
+        hit (bool): Whether the page was served from the cache.
+    """
+    key = OFFER_LIST_KEY_PREFIX + ('hits' if hit else 'misses')
+    if not await cache.aadd(key, 1, None):
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            await cache.aadd(key, 1, None)
+
+
+def get_offer_list_metrics():
+    """
+    Return the hit and miss counters and the current version of the offer list cache.
+
+    With a shared cache the counters cover all workers; ``shared_cache`` is
+    false if they only describe the worker that answered.
+
+    Returns:
+        dict: 'hits', 'misses', 'hit_ratio', 'version' and 'shared_cache'.
+    """
+    counters = cache.get_many([OFFER_LIST_KEY_PREFIX + field for field in OFFER_LIST_COUNTER_FIELDS])
+    hits = counters.get(OFFER_LIST_KEY_PREFIX + 'hits', 0)
+    misses = counters.get(OFFER_LIST_KEY_PREFIX + 'misses', 0)
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / (hits + misses), 3) if hits + misses else 0,
+        'version': get_offer_list_version(),
+        'shared_cache': cache_is_shared(),
+    }
@@ -0,0 +1,61 @@
+import json
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from coderr_app.api.serializers import OfferSerializer
+from coderr_app.bulk import bulk_create_offers
+
+
+class OfferImportSerializer(OfferSerializer):
+    """
+    Validates imported offers; the owner is checked by the command instead of the request.
+    """
+    class Meta(OfferSerializer.Meta):
+        fields = ['title', 'description', 'details']
+
+    def validate(self, attrs):
+        return attrs
+
+
+class Command(BaseCommand):
+    """
+    Imports offers for a business user from a JSON file.
+
+    The file contains a list of offers in the format of the offer creation
+    endpoint. Offers are inserted in batched transactions with bulk_create.
+    """
+    help = 'Import offers with their details for a business user from a JSON file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path of the JSON file containing a list of offers.')
+        parser.add_argument('--user', required=True, help='Username of the business user owning the offers.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of offers inserted per transaction.')
+
+    def handle(self, *args, **options):
+        """
+        Validate the file and import its offers.
+
+        Raises:
+            CommandError: If the user is not a business user or the file is invalid.
+        """
+        try:
+            user = User.objects.select_related('profile').get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["user"]}" does not exist.')
+        if getattr(getattr(user, 'profile', None), 'type', None) != 'business':
+            raise CommandError('Only business users can own offers.')
+
+        try:
+            with open(options['path'], encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError) as error:
+            raise CommandError(f'Could not read {options["path"]}: {error}')
+        if not isinstance(data, list):
+            raise CommandError('The file must contain a list of offers.')
+
+        serializer = OfferImportSerializer(data=data, many=True)
+        if not serializer.is_valid():
+            errors = {index: error for index, error in enumerate(serializer.errors) if error}
+            raise CommandError(f'Invalid offers: {errors}')
+
+        offers = bulk_create_offers(user, serializer.validated_data, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Imported {len(offers)} offer(s).'))
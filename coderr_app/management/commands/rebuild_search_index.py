@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from coderr_app.search import rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the offer search index (SQLite FTS5 table or inverted index) from the offer table.
+
+    Needed after writes that bypass the model signals, and once after
+    migrating a non-SQLite database that already contains offers.
+    """
+    help = 'Rebuild the offer full-text search index.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} offer(s).'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from coderr_app.stats import reconcile_stats
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the cached platform statistics served by the base-info endpoint.
+
+    Meant to be run periodically (e.g. from cron) to correct drift from
+    writes that bypass the model signals.
+    """
+    help = 'Recompute the cached platform statistics from the database.'
+
+    def handle(self, *args, **options):
+        stats = reconcile_stats()
+        for field, value in stats.items():
+            self.stdout.write(f'{field}: {value}')
+        self.stdout.write(self.style.SUCCESS('Platform statistics reconciled.'))
@@ -0,0 +1,80 @@
+import multiprocessing
+import signal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from coderr_app.jobs import Worker
+from coderr_app.list_cache import cache_is_shared
+from coderr_app.models import Job
+
+
+class Command(BaseCommand):
+    """
+    Runs the background job queue in one or more local worker processes.
+
+    Workers stop gracefully on SIGINT or SIGTERM after finishing their current
+    job. With --once the queue is drained in the current process and the
+    command exits, which suits cron or deploy hooks. --retry-failed puts jobs
+    that ran out of attempts back into the queue first.
+
+    Jobs invalidate cached data of the web workers (offer list version,
+    replaced images), which only reaches them through a shared cache, so
+    the command refuses to run on a process-local one.
+    """
+    help = 'Run background jobs from the database queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Number of worker processes.')
+        parser.add_argument('--batch-size', type=int, default=10, help='Number of jobs a worker claims at once.')
+        parser.add_argument('--once', action='store_true', help='Run all due jobs, then exit.')
+        parser.add_argument('--retry-failed', action='store_true', help='Queue failed jobs again before starting.')
+
+    def handle(self, *args, **options):
+        """
+        Start the workers and wait for them to stop.
+
+        Raises:
+            CommandError: If --processes is below 1 or combined with --once,
+                or if the default cache is process-local.
+        """
+        if not cache_is_shared():
+            raise CommandError('Jobs need a cache shared with the web workers: set CACHE_BACKEND=redis or database.')
+        if options['processes'] < 1:
+            raise CommandError('--processes must be at least 1.')
+        if options['once'] and options['processes'] > 1:
+            raise CommandError('--once runs in a single process.')
+
+        if options['retry_failed']:
+            retried = Job.objects.filter(status='failed').update(status='pending', attempts=0)
+            self.stdout.write(f'Queued {retried} failed job(s) again.')
+
+        if options['processes'] == 1:
+            self.run_worker(options)
+            return
+
+        # Forked children must not share the parent's database connections.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        children = [context.Process(target=self.run_worker, args=(options,)) for _ in range(options['processes'])]
+        for child in children:
+            child.start()
+
+        def stop_children(signum, frame):
+            for child in children:
+                if child.is_alive():
+                    child.terminate()
+
+        signal.signal(signal.SIGINT, stop_children)
+        signal.signal(signal.SIGTERM, stop_children)
+        for child in children:
+            child.join()
+
+    def run_worker(self, options):
+        worker = Worker(batch_size=options['batch_size'])
+        previous = {signum: signal.signal(signum, worker.stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+        self.stdout.write(f'Worker {worker.name} started.')
+        try:
+            succeeded, failed = worker.run(until_empty=options['once'])
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker.name} stopped: {succeeded} job(s) done, {failed} failed.'))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Min
+from coderr_app.list_cache import bump_offer_list_version
+from coderr_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Backfills the denormalized min_price and min_delivery_time columns on Offer.
+
+    With --check the command only reports offers whose stored values differ
+    from their details and fails if any drift is found.
+    """
+    help = 'Backfill and check the denormalized min_price / min_delivery_time columns of offers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only report drifted offers, do not write anything.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of offers written per query.')
+
+    def handle(self, *args, **options):
+        """
+        Compare the stored values with the aggregated details and fix or report the differences.
+
+        Raises:
+            CommandError: If --check is given and drifted offers were found.
+        """
+        queryset = Offer.objects.annotate(
+            actual_min_price=Min('details__price'),
+            actual_min_delivery_time=Min('details__delivery_time_in_days'),
+        ).only('id', 'min_price', 'min_delivery_time').order_by('id')
+
+        drifted = []
+        for offer in queryset.iterator(chunk_size=options['batch_size']):
+            if offer.min_price != offer.actual_min_price or offer.min_delivery_time != offer.actual_min_delivery_time:
+                offer.min_price = offer.actual_min_price
+                offer.min_delivery_time = offer.actual_min_delivery_time
+                drifted.append(offer)
+
+        if options['check']:
+            for offer in drifted:
+                self.stdout.write(f'Offer #{offer.id} is out of sync.')
+            if drifted:
+                raise CommandError(f'{len(drifted)} offer(s) out of sync.')
+            self.stdout.write(self.style.SUCCESS('All offers are in sync.'))
+            return
+
+        with transaction.atomic():
+            Offer.objects.bulk_update(drifted, ['min_price', 'min_delivery_time'], batch_size=options['batch_size'])
+            if drifted:
+                bump_offer_list_version()
+        self.stdout.write(self.style.SUCCESS(f'Updated {len(drifted)} offer(s).'))
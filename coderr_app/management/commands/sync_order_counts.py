@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from coderr_app.models import Order, OrderCount
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the per-status order counters of all business users from the order table.
+
+    With --check the command only reports counters that differ from the
+    actual number of orders and fails if any drift is found.
+    """
+    help = 'Backfill and check the per-status order counters of business users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only report drifted counters, do not write anything.')
+
+    def handle(self, *args, **options):
+        """
+        Compare the stored counters with the counted orders and fix or report the differences.
+
+        Raises:
+            CommandError: If --check is given and drifted counters were found.
+        """
+        actual = {
+            (row['business_user_id'], row['status']): row['count']
+            for row in Order.objects.values('business_user_id', 'status').annotate(count=Count('id')).order_by()
+        }
+        stored = {
+            (counter.business_user_id, counter.status): counter
+            for counter in OrderCount.objects.only('id', 'business_user_id', 'status', 'count')
+        }
+
+        drifted = []
+        for key in sorted(set(actual) | set(stored)):
+            counter = stored.get(key)
+            stored_count = counter.count if counter else 0
+            if stored_count != actual.get(key, 0):
+                drifted.append((key, stored_count, actual.get(key, 0)))
+
+        if options['check']:
+            for (business_user_id, status), stored_count, actual_count in drifted:
+                self.stdout.write(f'Business user #{business_user_id} {status}: stored {stored_count}, actual {actual_count}.')
+            if drifted:
+                raise CommandError(f'{len(drifted)} counter(s) out of sync.')
+            self.stdout.write(self.style.SUCCESS('All order counters are in sync.'))
+            return
+
+        with transaction.atomic():
+            for (business_user_id, status), stored_count, actual_count in drifted:
+                OrderCount.objects.update_or_create(
+                    business_user_id=business_user_id, status=status, defaults={'count': actual_count},
+                )
+        self.stdout.write(self.style.SUCCESS(f'Updated {len(drifted)} counter(s).'))
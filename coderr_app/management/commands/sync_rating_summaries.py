@@ -0,0 +1,62 @@
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from coderr_app.models import RatingSummary
+
+SUMMARY_FIELDS = ['review_count', 'rating_sum', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the rating summaries of all business users from the review table.
+
+    With --check the command only reports summaries that differ from the
+    actual reviews and fails if any drift is found.
+    """
+    help = 'Backfill and check the rating summaries of business users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only report drifted summaries, do not write anything.')
+
+    def handle(self, *args, **options):
+        """
+        Compare the stored summaries with the counted reviews and fix or report the differences.
+
+        Raises:
+            CommandError: If --check is given and drifted summaries were found.
+        """
+        actual = RatingSummary.count_reviews()
+        stored = {
+            summary.business_user_id: {field: getattr(summary, field) for field in SUMMARY_FIELDS}
+            for summary in RatingSummary.objects.only('business_user_id', *SUMMARY_FIELDS)
+        }
+        empty = dict.fromkeys(SUMMARY_FIELDS, 0)
+
+        drifted = []
+        for business_user_id in sorted(set(actual) | set(stored)):
+            stored_counts = stored.get(business_user_id, empty)
+            actual_counts = actual.get(business_user_id, empty)
+            if stored_counts != actual_counts:
+                drifted.append((business_user_id, stored_counts, actual_counts))
+
+        if options['check']:
+            for business_user_id, stored_counts, actual_counts in drifted:
+                self.stdout.write(
+                    f'Business user #{business_user_id}: stored {stored_counts["review_count"]} review(s) '
+                    f'rated {stored_counts["rating_sum"]}, actual {actual_counts["review_count"]} rated {actual_counts["rating_sum"]}.'
+                )
+            if drifted:
+                raise CommandError(f'{len(drifted)} rating summary row(s) out of sync.')
+            self.stdout.write(self.style.SUCCESS('All rating summaries are in sync.'))
+            return
+
+        with transaction.atomic():
+            for business_user_id, stored_counts, actual_counts in drifted:
+                if business_user_id not in actual:
+                    RatingSummary.objects.filter(business_user_id=business_user_id).delete()
+                    continue
+                average_rating = round(Decimal(actual_counts['rating_sum']) / actual_counts['review_count'], 2)
+                RatingSummary.objects.update_or_create(
+                    business_user_id=business_user_id, defaults={**actual_counts, 'average_rating': average_rating},
+                )
+        self.stdout.write(self.style.SUCCESS(f'Updated {len(drifted)} rating summary row(s).'))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_order_counts(apps, schema_editor):
+    Order = apps.get_model('coderr_app', 'Order')
+    OrderCount = apps.get_model('coderr_app', 'OrderCount')
+    rows = Order.objects.values('business_user', 'status').annotate(total=Count('id')).order_by()
+    OrderCount.objects.bulk_create(
+        [OrderCount(business_user_id=row['business_user'], status=row['status'], count=row['total']) for row in rows],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('business_user', 'status')},
+            },
+        ),
+        migrations.RunPython(backfill_order_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE coderr_app_offer_fts USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        'INSERT INTO coderr_app_offer_fts (rowid, title, description) SELECT id, title, description FROM coderr_app_offer'
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS coderr_app_offer_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0003_rating_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='coderr_app.offer')),
+            ],
+            options={
+                'unique_together': {('term', 'offer')},
+            },
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -1,4 +1,7 @@
+from decimal import Decimal
 from django.db import models
+from django.db.models import Count, F, Min, Q, Sum
+from django.db.models.functions import Greatest
 from django.forms import ValidationError
 from django.contrib.auth.models import User
 
@@ -10,7 +13,10 @@ class Offer(models.Model):
         user (ForeignKey): The business user who created the offer.
         title (CharField): The title of the offer.
         image (ImageField): An optional image for the offer.
+        image_variants (JSONField): Storage names of the WebP variants of the image per size.
         description (TextField): The description of the offer.
+        min_price (DecimalField): The lowest price of all offer details, kept in sync by the write paths.
+        min_delivery_time (PositiveIntegerField): The shortest delivery time of all offer details, kept in sync by the write paths.
         created_at (DateTimeField): The date and time the offer was created.
         updated_at (DateTimeField): The date and time the offer was last updated.
     """
@@ -18,10 +24,19 @@ class Offer(models.Model):
     user = models.ForeignKey(User, related_name='offers', on_delete=models.CASCADE, limit_choices_to={'profile__type': 'business'})
     title = models.CharField(max_length=255)
     image = models.ImageField(upload_to='offers/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True)
     description = models.TextField()
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, db_index=True)
+    min_delivery_time = models.PositiveIntegerField(null=True, blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-updated_at'], name='offer_updated_idx'),
+            models.Index(fields=['user', '-updated_at'], name='offer_user_updated_idx'),
+        ]
+
     def clean(self):
         """
         Validates that the offer has exactly three details.
@@ -36,6 +51,24 @@ class Offer(models.Model):
                     'An offer must contain exactly 3 details (basic, standard, premium).'
                 )
 
+    def compute_min_values(self):
+        """
+        Computes the minimum price and delivery time from the stored offer details.
+
+        Returns:
+            dict: The values for 'min_price' and 'min_delivery_time'.
+        """
+        return self.details.aggregate(min_price=Min('price'), min_delivery_time=Min('delivery_time_in_days'))
+
+    def refresh_min_values(self):
+        """
+        Recomputes and stores the denormalized minimum price and delivery time.
+        """
+        values = self.compute_min_values()
+        self.min_price = values['min_price']
+        self.min_delivery_time = values['min_delivery_time']
+        self.save(update_fields=['min_price', 'min_delivery_time'])
+
     def __str__(self):
         return self.title
     
@@ -111,9 +144,61 @@ class Order(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='in_progress')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'status'], name='order_business_status_idx'),
+            models.Index(fields=['business_user', '-updated_at'], name='order_business_updated_idx'),
+            models.Index(fields=['customer_user', '-updated_at'], name='order_customer_updated_idx'),
+        ]
     
     def __str__(self):
         return f'Order #{self.id} - {self.title}'
+
+
+class OrderCount(models.Model):
+    """
+    Stores the number of orders per business user and status.
+
+    Kept current by the order write paths and an ``Order`` post_delete
+    receiver so the order count endpoints read a single row instead of
+    counting orders. ``manage.py sync_order_counts`` repairs drift.
+
+    Attributes:
+        business_user (ForeignKey): The business user the orders belong to.
+        status (CharField): The order status that is counted.
+        count (PositiveIntegerField): The number of orders with that status.
+    """
+
+    business_user = models.ForeignKey(User, related_name='order_counts', on_delete=models.CASCADE)
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('business_user', 'status')
+
+    @classmethod
+    def adjust(cls, business_user_id, status, delta):
+        """
+        Atomically adds ``delta`` to the counter, creating the row if needed.
+        The counter never drops below zero, so a missing row is not created
+        for a negative ``delta``; this keeps cascaded deletes of the business
+        user itself from recreating its counters.
+
+        Args:
+            business_user_id (int): The id of the business user.
+            status (str): The order status.
+            delta (int): The amount to add (may be negative).
+        """
+        counters = cls.objects.filter(business_user_id=business_user_id, status=status)
+        new_count = Greatest(F('count') + delta, 0)
+        if not counters.update(count=new_count) and delta > 0:
+            counter, created = cls.objects.get_or_create(business_user_id=business_user_id, status=status, defaults={'count': max(delta, 0)})
+            if not created:
+                counters.update(count=new_count)
+
+    def __str__(self):
+        return f'{self.business_user} - {self.status}: {self.count}'
     
 
 class Review(models.Model):
@@ -135,6 +220,205 @@ class Review(models.Model):
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-updated_at'], name='review_updated_idx'),
+            models.Index(fields=['business_user', '-updated_at'], name='review_business_updated_idx'),
+            models.Index(fields=['reviewer', '-updated_at'], name='review_reviewer_updated_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the stored rating so signal receivers can compute rating deltas.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_rating = instance.__dict__.get('rating')
+        return instance
     
     def __str__(self):
-        return f'Review {self.rating}/5 by {self.reviewer} for {self.business_user}'
\ No newline at end of file
+        return f'Review {self.rating}/5 by {self.reviewer} for {self.business_user}'
+
+
+class RatingSummary(models.Model):
+    """
+    Stores the precomputed review statistics of a business user.
+
+    Kept current by the review signal receivers so averages and "top rated"
+    listings never aggregate over all reviews.
+
+    Attributes:
+        business_user (OneToOneField): The reviewed business user.
+        review_count (PositiveIntegerField): The number of reviews.
+        rating_sum (PositiveIntegerField): The sum of all ratings.
+        rating_1 .. rating_5 (PositiveIntegerField): The number of reviews per rating.
+        average_rating (DecimalField): The average rating, indexed for sorting.
+    """
+
+    business_user = models.OneToOneField(User, related_name='rating_summary', on_delete=models.CASCADE, primary_key=True)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+    average_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0, db_index=True)
+
+    @property
+    def histogram(self):
+        """
+        Returns the number of reviews per rating from 1 to 5.
+        """
+        return {rating: getattr(self, f'rating_{rating}') for rating in range(1, 6)}
+
+    @classmethod
+    def record(cls, business_user_id, added=None, removed=None):
+        """
+        Adds and/or removes a rating from the summary of a business user.
+
+        Must be called inside a transaction; the summary row is locked while it is updated.
+
+        Args:
+            business_user_id (int): The id of the reviewed business user.
+            added (int): The rating of a new review, if any.
+            removed (int): The rating of a removed review, if any.
+        """
+        if added is None:
+            summary = cls.objects.select_for_update().filter(business_user_id=business_user_id).first()
+            if summary is None:
+                return
+        else:
+            summary, created = cls.objects.select_for_update().get_or_create(business_user_id=business_user_id)
+
+        if removed is not None:
+            summary.review_count = max(summary.review_count - 1, 0)
+            summary.rating_sum = max(summary.rating_sum - removed, 0)
+            if 1 <= removed <= 5:
+                field = f'rating_{removed}'
+                setattr(summary, field, max(getattr(summary, field) - 1, 0))
+        if added is not None:
+            summary.review_count += 1
+            summary.rating_sum += added
+            if 1 <= added <= 5:
+                field = f'rating_{added}'
+                setattr(summary, field, getattr(summary, field) + 1)
+
+        summary.average_rating = round(Decimal(summary.rating_sum) / summary.review_count, 2) if summary.review_count else 0
+        summary.save()
+
+    @classmethod
+    def count_reviews(cls, business_user_ids=None):
+        """
+        Counts the summary figures of business users from the review table.
+
+        Args:
+            business_user_ids (list): The business users to count, or None for all reviewed ones.
+
+        Returns:
+            dict: The summary fields (without ``average_rating``) by business user id.
+        """
+        reviews = Review.objects.all()
+        if business_user_ids is not None:
+            reviews = reviews.filter(business_user_id__in=business_user_ids)
+        histogram = {f'rating_{rating}': Count('id', filter=Q(rating=rating)) for rating in range(1, 6)}
+        rows = reviews.values('business_user_id').annotate(review_count=Count('id'), rating_sum=Sum('rating'), **histogram).order_by()
+        return {row.pop('business_user_id'): row for row in rows}
+
+    @classmethod
+    def rebuild(cls, business_user_id):
+        """
+        Recounts the summary of a business user from the review table.
+
+        Used when a review write cannot be applied as a delta because its
+        previous rating is unknown. Must be called inside a transaction.
+        """
+        counts = cls.count_reviews([business_user_id]).get(business_user_id)
+        if counts is None:
+            cls.objects.filter(business_user_id=business_user_id).delete()
+            return
+        average_rating = round(Decimal(counts['rating_sum']) / counts['review_count'], 2)
+        cls.objects.update_or_create(business_user_id=business_user_id, defaults={**counts, 'average_rating': average_rating})
+
+    def __str__(self):
+        return f'{self.business_user}: {self.average_rating} ({self.review_count} reviews)'
+
+
+class OfferSearchTerm(models.Model):
+    """
+    One entry of the inverted offer search index used on databases without SQLite FTS5.
+
+    Maintained by ``coderr_app.search``; every distinct term of an offer's
+    title and description is stored once with its weighted frequency.
+
+    Attributes:
+        term (CharField): The lower-cased token.
+        offer (ForeignKey): The offer containing the term.
+        weight (PositiveIntegerField): Occurrences of the term, title occurrences counted double.
+    """
+
+    term = models.CharField(max_length=100)
+    offer = models.ForeignKey(Offer, related_name='search_terms', on_delete=models.CASCADE)
+    weight = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        unique_together = ('term', 'offer')
+
+    def __str__(self):
+        return f'{self.term} -> {self.offer_id}'
+
+
+class Job(models.Model):
+    """
+    A unit of deferred work in the database-backed job queue.
+
+    Jobs are enqueued with ``coderr_app.jobs.enqueue`` inside the transaction
+    of the write that caused them and executed by the ``run_jobs`` workers.
+    Finished jobs are deleted; jobs that ran out of attempts are kept as failed.
+
+    Attributes:
+        name (CharField): The registered name of the handler to run.
+        payload (JSONField): Keyword arguments passed to the handler.
+        idempotency_key (CharField): Optional key; only one pending job may exist per key.
+        status (CharField): 'pending', 'running' or 'failed'.
+        attempts (PositiveIntegerField): The number of times the job was started.
+        max_attempts (PositiveIntegerField): Attempts after which the job is marked as failed.
+        run_after (DateTimeField): The job is not started before this time.
+        locked_by (CharField): The worker that claimed the job.
+        locked_at (DateTimeField): When the job was claimed.
+        last_error (TextField): The traceback of the last failed attempt.
+        created_at (DateTimeField): The date and time the job was enqueued.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    idempotency_key = models.CharField(max_length=200, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField()
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['idempotency_key'],
+                condition=models.Q(status='pending'),
+                name='job_unique_pending_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
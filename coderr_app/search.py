@@ -0,0 +1,204 @@
+import re
+from collections import Counter
+from django.db import connection
+from django.db.models import Exists, FloatField, OuterRef, Q, Subquery, Sum
+from django.db.models.expressions import RawSQL
+from coderr_app.jobs import enqueue, job
+from coderr_app.list_cache import bump_offer_list_version
+from coderr_app.models import Offer, OfferSearchTerm
+
+FTS_TABLE = 'coderr_app_offer_fts'
+TITLE_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+MAX_TERM_LENGTH = 100
+MAX_QUERY_TERMS = 10
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def use_fts():
+    """
+    Return whether offers are searched through the SQLite FTS5 table.
+    """
+    return connection.vendor == 'sqlite'
+
+
+def tokenize(text):
+    """
+    Split a text into lower-cased search terms.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        list: The terms in their order of appearance.
+    """
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_PATTERN.findall(text.lower())]
+
+
+def offer_terms(offer):
+    """
+    Count the weighted terms of an offer's title and description.
+
+    Args:
+        offer (Offer): The offer to index.
+
+    Returns:
+        Counter: The weight per term.
+    """
+    terms = Counter()
+    for term in tokenize(offer.title):
+        terms[term] += TITLE_WEIGHT
+    for term in tokenize(offer.description):
+        terms[term] += DESCRIPTION_WEIGHT
+    return terms
+
+
+def index_offers(offers):
+    """
+    Add or replace the search index entries of the given offers.
+
+    Runs in the caller's transaction. Offer writes do not call this directly
+    but enqueue the ``search.reindex_offers`` job with ``enqueue_reindex``.
+
+    Args:
+        offers (list): Saved Offer instances.
+    """
+    offers = list(offers)
+    if not offers:
+        return
+    if use_fts():
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)',
+                [(offer.pk, offer.title, offer.description) for offer in offers],
+            )
+        return
+    remove_offers([offer.pk for offer in offers])
+    OfferSearchTerm.objects.bulk_create(
+        [
+            OfferSearchTerm(term=term, offer_id=offer.pk, weight=weight)
+            for offer in offers
+            for term, weight in offer_terms(offer).items()
+        ],
+        batch_size=500,
+    )
+
+
+def remove_offers(offer_ids):
+    """
+    Remove the search index entries of the given offers.
+
+    Args:
+        offer_ids (list): The ids of the offers to remove.
+    """
+    offer_ids = list(offer_ids)
+    if not offer_ids:
+        return
+    if use_fts():
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(offer_id,) for offer_id in offer_ids])
+        return
+    OfferSearchTerm.objects.filter(offer_id__in=offer_ids).delete()
+
+
+def enqueue_reindex(offer_ids):
+    """
+    Enqueue the ``search.reindex_offers`` job for saved or deleted offers.
+
+    A single offer is keyed by its id, so repeated writes to it before a
+    worker picks up the job are indexed once.
+
+    Args:
+        offer_ids (list): The ids of the offers to reindex.
+    """
+    offer_ids = sorted(offer_ids)
+    if not offer_ids:
+        return
+    key = f'search:offer:{offer_ids[0]}' if len(offer_ids) == 1 else None
+    enqueue('search.reindex_offers', {'offer_ids': offer_ids}, idempotency_key=key)
+
+
+@job('search.reindex_offers')
+def reindex_offers(offer_ids):
+    """
+    Job handler that indexes the given offers and removes the ones that no longer exist.
+
+    Cached offer list pages may hold search results from before the job ran,
+    so they are invalidated as well.
+
+    Args:
+        offer_ids (list): The ids of the offers to reindex.
+    """
+    offers = list(Offer.objects.filter(pk__in=offer_ids).only('id', 'title', 'description'))
+    index_offers(offers)
+    remove_offers(set(offer_ids) - {offer.pk for offer in offers})
+    bump_offer_list_version()
+
+
+def rebuild_index():
+    """
+    Rebuild the whole offer search index from the offer table.
+
+    Returns:
+        int: The number of indexed offers.
+    """
+    if use_fts():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, title, description) SELECT id, title, description FROM {Offer._meta.db_table}')
+        return Offer.objects.count()
+
+    OfferSearchTerm.objects.all().delete()
+    count = 0
+    offers = Offer.objects.only('id', 'title', 'description').order_by('id')
+    batch = []
+    for offer in offers.iterator(chunk_size=500):
+        batch.append(offer)
+        if len(batch) == 500:
+            index_offers(batch)
+            count += len(batch)
+            batch = []
+    index_offers(batch)
+    return count + len(batch)
+
+
+def search_offers(queryset, query):
+    """
+    Restrict an offer queryset to the offers matching a search query and rank them.
+
+    Every term of the query must match; the last term also matches as a
+    prefix so results update while the user is typing. The matches are
+    annotated with ``search_rank`` (lower is better) and the whole lookup
+    stays part of the queryset's single SQL query.
+
+    Args:
+        queryset (QuerySet): The offer queryset, possibly already filtered.
+        query (str): The raw search input.
+
+    Returns:
+        QuerySet: The matching offers annotated with ``search_rank``, or the
+        unchanged queryset if the query contains no terms.
+    """
+    terms = tokenize(query)[:MAX_QUERY_TERMS]
+    if not terms:
+        return queryset
+
+    if use_fts():
+        match = ' '.join(f'"{term}"' for term in terms) + '*'
+        matches = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+        rank = RawSQL(
+            f'SELECT bm25({FTS_TABLE}, %s, %s) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = {Offer._meta.db_table}.id',
+            [TITLE_WEIGHT, DESCRIPTION_WEIGHT, match],
+            output_field=FloatField(),
+        )
+        return queryset.filter(id__in=matches).annotate(search_rank=rank)
+
+    *whole_terms, prefix = terms
+    term_filters = [Q(term=term) for term in whole_terms] + [Q(term__startswith=prefix)]
+    for term_filter in term_filters:
+        queryset = queryset.filter(Exists(OfferSearchTerm.objects.filter(term_filter, offer=OuterRef('pk'))))
+    weights = (
+        OfferSearchTerm.objects.filter(Q(term__in=whole_terms) | Q(term__startswith=prefix), offer=OuterRef('pk'))
+        .values('offer').annotate(total=Sum('weight')).values('total')
+    )
+    return queryset.annotate(search_rank=-Subquery(weights, output_field=FloatField()))
@@ -0,0 +1,193 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.contrib.auth.models import User
+from django.dispatch import receiver
+from auth_app.models import Profile
+from coderr_app.images import enqueue_image_processing, is_new_upload, reset_image_variants
+from coderr_app.list_cache import bump_offer_list_version
+from coderr_app.models import Offer, OfferDetail, Order, OrderCount, RatingSummary, Review
+from coderr_app.search import enqueue_reindex
+from coderr_app.stats import adjust_stats, invalidate_stats
+from coderr_app.suggest import offer_removed, offer_titles_changed
+
+
+@receiver(post_save, sender=Review)
+def update_review_stats(sender, instance, created, **kwargs):
+    """
+    Signal receiver to keep the cached review count and rating sum and the
+    rating summary of the reviewed business user current.
+
+    Covers every save, not only the API: a changed rating is applied as a
+    delta against the rating the instance was loaded with. If that is
+    unknown, the summary is recounted and the cached counters are dropped.
+
+    Args:
+        sender: The model class (Review) that sent the signal.
+        instance: The Review instance being saved.
+        created: A boolean indicating if the Review was newly created.
+        **kwargs: Additional keyword arguments from the signal.
+    """
+    with transaction.atomic():
+        if created:
+            RatingSummary.record(instance.business_user_id, added=instance.rating)
+            adjust_stats(review_count=1, rating_sum=instance.rating)
+        elif getattr(instance, '_loaded_rating', None) is None:
+            RatingSummary.rebuild(instance.business_user_id)
+            invalidate_stats()
+        elif instance.rating != instance._loaded_rating:
+            RatingSummary.record(instance.business_user_id, added=instance.rating, removed=instance._loaded_rating)
+            adjust_stats(rating_sum=instance.rating - instance._loaded_rating)
+    instance._loaded_rating = instance.rating
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_stats(sender, instance, **kwargs):
+    """
+    Signal receiver to remove a deleted review from the cached counters and
+    from the rating summary of the reviewed business user.
+
+    Runs inside the delete transaction, so cascaded deletes are covered too.
+    """
+    RatingSummary.record(instance.business_user_id, removed=instance.rating)
+    adjust_stats(review_count=-1, rating_sum=-instance.rating)
+
+
+@receiver(post_delete, sender=Order)
+def remove_order_count(sender, instance, **kwargs):
+    """
+    Signal receiver to remove a deleted order from the status counter of its business user.
+
+    Runs inside the delete transaction, so cascaded deletes (e.g. of the
+    customer user) and queryset deletes are covered too.
+    """
+    OrderCount.adjust(instance.business_user_id, instance.status, -1)
+
+
+@receiver(post_save, sender=Profile)
+def update_business_profile_stats(sender, instance, created, **kwargs):
+    """
+    Signal receiver to keep the cached business profile count current.
+
+    Args:
+        sender: The model class (Profile) that sent the signal.
+        instance: The Profile instance being saved.
+        created: A boolean indicating if the Profile was newly created.
+        **kwargs: Additional keyword arguments from the signal.
+    """
+    is_business = instance.type == 'business'
+    if created:
+        adjust_stats(business_profile_count=int(is_business))
+    elif not hasattr(instance, '_loaded_type'):
+        invalidate_stats()
+    else:
+        was_business = instance._loaded_type == 'business'
+        adjust_stats(business_profile_count=int(is_business) - int(was_business))
+    instance._loaded_type = instance.type
+
+
+@receiver(post_delete, sender=Profile)
+def remove_business_profile_stats(sender, instance, **kwargs):
+    """
+    Signal receiver to remove a deleted business profile from the cached counters.
+    """
+    if instance.type == 'business':
+        adjust_stats(business_profile_count=-1)
+
+
+@receiver(post_save, sender=Offer)
+def update_offer_stats(sender, instance, created, **kwargs):
+    """
+    Signal receiver to count newly created offers.
+    """
+    if created:
+        adjust_stats(offer_count=1)
+
+
+@receiver(post_delete, sender=Offer)
+def remove_offer_stats(sender, instance, **kwargs):
+    """
+    Signal receiver to remove a deleted offer from the cached counters.
+    """
+    adjust_stats(offer_count=-1)
+
+
+@receiver(post_save, sender=Offer)
+def update_offer_search_index(sender, instance, update_fields, **kwargs):
+    """
+    Signal receiver to enqueue the reindexing of an offer whose title or description may have changed.
+
+    Saves restricted to other fields, such as the min value refresh, are skipped.
+    """
+    if update_fields is not None and not {'title', 'description'} & set(update_fields):
+        return
+    enqueue_reindex([instance.pk])
+
+
+@receiver(post_delete, sender=Offer)
+def remove_offer_search_index(sender, instance, **kwargs):
+    """
+    Signal receiver to enqueue the removal of a deleted offer from the search index.
+    """
+    enqueue_reindex([instance.pk])
+
+
+@receiver(post_save, sender=Offer)
+def update_offer_suggestions(sender, instance, update_fields, **kwargs):
+    """
+    Signal receiver to update the in-process title suggestion index.
+    """
+    if update_fields is not None and 'title' not in update_fields:
+        return
+    offer_titles_changed([instance])
+
+
+@receiver(post_delete, sender=Offer)
+def remove_offer_suggestions(sender, instance, **kwargs):
+    """
+    Signal receiver to drop a deleted offer from the title suggestion index.
+    """
+    offer_removed(instance.pk)
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offer_list_cache(sender, **kwargs):
+    """
+    Signal receiver to invalidate the cached anonymous offer list pages on offer writes.
+    """
+    bump_offer_list_version()
+
+
+@receiver(post_save, sender=User)
+def invalidate_offer_list_cache_for_user(sender, instance, update_fields, **kwargs):
+    """
+    Signal receiver to invalidate the cached offer list pages when a user changes,
+    since the pages embed the name of every offer's creator.
+
+    Saves that only record the last login are skipped.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_offer_list_version()
+
+
+@receiver(pre_save, sender=Offer)
+def reset_offer_image_variants(sender, instance, **kwargs):
+    """
+    Signal receiver to drop the variants of a replaced or cleared offer image.
+
+    A new upload is flagged so that its processing is enqueued after the save.
+    """
+    instance._image_uploaded = is_new_upload(instance.image)
+    instance.image_variants = reset_image_variants(instance.image, instance.image_variants)
+
+
+@receiver(post_save, sender=Offer)
+def process_offer_image(sender, instance, **kwargs):
+    """
+    Signal receiver to enqueue the stripping and variant generation of a newly uploaded offer image.
+    """
+    if instance.__dict__.pop('_image_uploaded', False):
+        enqueue_image_processing(instance, 'image', 'image_variants')
@@ -0,0 +1,120 @@
+import asyncio
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+from auth_app.models import Profile
+from coderr_app.models import Offer, RatingSummary
+
+STATS_KEY_PREFIX = 'base-info:'
+STATS_FIELDS = ['review_count', 'rating_sum', 'business_profile_count', 'offer_count']
+
+
+def compute_stats():
+    """
+    Compute all platform counters from the database.
+
+    Review figures are summed from the per-business rating summaries
+    instead of aggregating over all reviews.
+
+    Returns:
+        dict: The review count, rating sum, business profile count and offer count.
+    """
+    review_stats = RatingSummary.objects.aggregate(review_count=Sum('review_count'), rating_sum=Sum('rating_sum'))
+    return {
+        'review_count': review_stats['review_count'] or 0,
+        'rating_sum': review_stats['rating_sum'] or 0,
+        'business_profile_count': Profile.objects.filter(type='business').count(),
+        'offer_count': Offer.objects.count(),
+    }
+
+
+async def acompute_stats():
+    """
+    Async counterpart of ``compute_stats``; the independent aggregates are awaited concurrently.
+
+    Returns:
+        dict: The review count, rating sum, business profile count and offer count.
+    """
+    review_stats, business_profile_count, offer_count = await asyncio.gather(
+        RatingSummary.objects.aaggregate(review_count=Sum('review_count'), rating_sum=Sum('rating_sum')),
+        Profile.objects.filter(type='business').acount(),
+        Offer.objects.acount(),
+    )
+    return {
+        'review_count': review_stats['review_count'] or 0,
+        'rating_sum': review_stats['rating_sum'] or 0,
+        'business_profile_count': business_profile_count,
+        'offer_count': offer_count,
+    }
+
+
+def reconcile_stats():
+    """
+    Recompute all counters and store them in the cache.
+
+    The cache entries expire after ``BASE_INFO_CACHE_TIMEOUT`` seconds so
+    that drift from writes bypassing the signals is corrected periodically.
+
+    Returns:
+        dict: The recomputed counters.
+    """
+    stats = compute_stats()
+    cache.set_many({STATS_KEY_PREFIX + field: value for field, value in stats.items()}, settings.BASE_INFO_CACHE_TIMEOUT)
+    return stats
+
+
+def get_stats():
+    """
+    Return the platform counters, served from the cache when possible.
+
+    Returns:
+        dict: The review count, rating sum, business profile count and offer count.
+    """
+    cached = cache.get_many([STATS_KEY_PREFIX + field for field in STATS_FIELDS])
+    if len(cached) != len(STATS_FIELDS):
+        return reconcile_stats()
+    return {field: cached[STATS_KEY_PREFIX + field] for field in STATS_FIELDS}
+
+
+async def aget_stats():
+    """
+    Async counterpart of ``get_stats``.
+
+    Returns:
+        dict: The review count, rating sum, business profile count and offer count.
+    """
+    cached = await cache.aget_many([STATS_KEY_PREFIX + field for field in STATS_FIELDS])
+    if len(cached) != len(STATS_FIELDS):
+        stats = await acompute_stats()
+        await cache.aset_many({STATS_KEY_PREFIX + field: value for field, value in stats.items()}, settings.BASE_INFO_CACHE_TIMEOUT)
+        return stats
+    return {field: cached[STATS_KEY_PREFIX + field] for field in STATS_FIELDS}
+
+
+def adjust_stats(**deltas):
+    """
+    Incrementally adjust cached counters once the current transaction commits.
+
+    Counters that are not cached are left alone; they are recomputed on the next read.
+
+    Args:
+        **deltas: The amount to add per counter, e.g. ``review_count=1``.
+    """
+    def apply():
+        for field, delta in deltas.items():
+            if not delta:
+                continue
+            try:
+                cache.incr(STATS_KEY_PREFIX + field, delta)
+            except ValueError:
+                pass
+
+    transaction.on_commit(apply)
+
+
+def invalidate_stats():
+    """
+    Drop the cached counters once the current transaction commits.
+    """
+    transaction.on_commit(lambda: cache.delete_many([STATS_KEY_PREFIX + field for field in STATS_FIELDS]))
@@ -0,0 +1,292 @@
+import bisect
+import sys
+import threading
+import time
+from django.conf import settings
+from django.db import transaction
+from coderr_app.models import Offer
+from coderr_app.search import search_offers, tokenize
+
+ENTRY_OVERHEAD = 120
+
+
+class TitleSuggestionIndex:
+    """
+    In-process prefix index over offer titles.
+
+    Every title is stored once per word as the lower-cased rest of the title
+    starting at that word, in a sorted list, so a prefix lookup is a
+    ``bisect`` followed by a short forward scan. The index of a worker is
+    built lazily by its first lookup, updated incrementally by the offer
+    signals of the same worker and rebuilt after
+    ``OFFER_SUGGEST_REFRESH_INTERVAL`` seconds to pick up changes made by
+    other workers.
+
+    A rebuild reads the offer table without holding the lock: one request
+    loads the new entries while the others keep using the current ones (or
+    the database before the first build), then the entries are swapped in.
+    Changes signalled during the load are replayed on the new entries.
+
+    If the estimated size exceeds ``OFFER_SUGGEST_MEMORY_BUDGET`` the index is
+    dropped and lookups fall back to the database until the next rebuild.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self.pending_changes = None
+        self.reset()
+        self.reset_metrics()
+
+    def reset(self):
+        """
+        Drop all entries and mark the index as not built.
+        """
+        self.entries = []
+        self.titles = {}
+        self.estimated_bytes = 0
+        self.built_at = None
+        self.over_budget = False
+
+    def reset_metrics(self):
+        """
+        Zero the lookup statistics.
+        """
+        self.lookups = 0
+        self.hits = 0
+        self.fallbacks = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.rebuilds = 0
+        self.last_rebuild = 0.0
+        self.max_rebuild = 0.0
+
+    def entry_keys(self, title):
+        tokens = tokenize(title)
+        return [' '.join(tokens[start:]) for start in range(len(tokens))]
+
+    def entry_size(self, key):
+        return sys.getsizeof(key) + ENTRY_OVERHEAD
+
+    def is_stale(self):
+        return self.built_at is None or time.monotonic() - self.built_at > settings.OFFER_SUGGEST_REFRESH_INTERVAL
+
+    def load(self):
+        """
+        Read the entries of a new index from the offer table, without touching the current one.
+
+        Returns:
+            tuple: The sorted entries, the titles per offer id, the estimated size
+            and whether the budget was exceeded.
+        """
+        budget = settings.OFFER_SUGGEST_MEMORY_BUDGET
+        entries, titles, size = [], {}, 0
+        for offer_id, title in Offer.objects.values_list('id', 'title').iterator(chunk_size=2000):
+            titles[offer_id] = title
+            for key in self.entry_keys(title):
+                entries.append((key, offer_id))
+                size += self.entry_size(key)
+            if size + sys.getsizeof(title) > budget:
+                return [], {}, 0, True
+            size += sys.getsizeof(title)
+        entries.sort()
+        return entries, titles, size, False
+
+    def build(self):
+        """
+        (Re)build the index from the offer table and swap it in.
+
+        The lock is only held to start recording changes and to swap in the
+        loaded entries, so lookups are not blocked while the table is read.
+        """
+        with self.lock:
+            self.pending_changes = []
+        started = time.perf_counter()
+        try:
+            entries, titles, size, over_budget = self.load()
+        except BaseException:
+            with self.lock:
+                self.pending_changes = None
+            raise
+        duration = time.perf_counter() - started
+        with self.lock:
+            changes, self.pending_changes = self.pending_changes, None
+            self.reset()
+            self.entries, self.titles, self.estimated_bytes, self.over_budget = entries, titles, size, over_budget
+            self.built_at = time.monotonic()
+            for offer_id, title in changes:
+                if title is None:
+                    self.discard(offer_id)
+                else:
+                    self.insert(offer_id, title)
+            self.rebuilds += 1
+            self.last_rebuild = duration
+            self.max_rebuild = max(self.max_rebuild, duration)
+
+    def refresh(self):
+        """
+        Rebuild a stale index unless another request of this worker is already rebuilding it.
+        """
+        if not self.is_stale() or not self.build_lock.acquire(blocking=False):
+            return
+        try:
+            if self.is_stale():
+                self.build()
+        finally:
+            self.build_lock.release()
+
+    def add(self, offer_id, title):
+        """
+        Add or replace the title of an offer in a built index.
+
+        Args:
+            offer_id (int): The id of the offer.
+            title (str): Its current title.
+        """
+        with self.lock:
+            if self.pending_changes is not None:
+                self.pending_changes.append((offer_id, title))
+            self.insert(offer_id, title)
+
+    def insert(self, offer_id, title):
+        if self.built_at is None or self.over_budget:
+            return
+        self.discard(offer_id)
+        keys = self.entry_keys(title)
+        added = sum(self.entry_size(key) for key in keys) + sys.getsizeof(title)
+        if self.estimated_bytes + added > settings.OFFER_SUGGEST_MEMORY_BUDGET:
+            self.reset()
+            self.over_budget = True
+            self.built_at = time.monotonic()
+            return
+        for key in keys:
+            bisect.insort(self.entries, (key, offer_id))
+        self.titles[offer_id] = title
+        self.estimated_bytes += added
+
+    def remove(self, offer_id):
+        """
+        Remove an offer from a built index.
+
+        Args:
+            offer_id (int): The id of the removed offer.
+        """
+        with self.lock:
+            if self.pending_changes is not None:
+                self.pending_changes.append((offer_id, None))
+            if self.built_at is not None:
+                self.discard(offer_id)
+
+    def discard(self, offer_id):
+        title = self.titles.pop(offer_id, None)
+        if title is None:
+            return
+        for key in self.entry_keys(title):
+            position = bisect.bisect_left(self.entries, (key, offer_id))
+            if position < len(self.entries) and self.entries[position] == (key, offer_id):
+                del self.entries[position]
+                self.estimated_bytes -= self.entry_size(key)
+        self.estimated_bytes -= sys.getsizeof(title)
+
+    def suggest(self, query, limit=10):
+        """
+        Return offers whose title contains a word sequence starting with the query.
+
+        Args:
+            query (str): The typed prefix.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            list: Dicts with the offer 'id' and 'title', in alphabetical order of the matched words.
+        """
+        prefix = ' '.join(tokenize(query))
+        if not prefix:
+            return []
+        started = time.perf_counter()
+        self.refresh()
+        with self.lock:
+            if self.built_at is None or self.over_budget:
+                suggestions = None
+            else:
+                suggestions = []
+                seen = set()
+                position = bisect.bisect_left(self.entries, (prefix,))
+                while position < len(self.entries) and len(suggestions) < limit:
+                    key, offer_id = self.entries[position]
+                    if not key.startswith(prefix):
+                        break
+                    if offer_id not in seen:
+                        seen.add(offer_id)
+                        suggestions.append({'id': offer_id, 'title': self.titles[offer_id]})
+                    position += 1
+        fallback = suggestions is None
+        if fallback:
+            suggestions = self.suggest_from_database(query, limit)
+        self.record_lookup(time.perf_counter() - started, bool(suggestions), fallback)
+        return suggestions
+
+    def suggest_from_database(self, query, limit):
+        offers = search_offers(Offer.objects.all(), query).order_by('title', 'id').values('id', 'title')
+        return list(offers[:limit])
+
+    def record_lookup(self, latency, hit, fallback):
+        with self.lock:
+            self.lookups += 1
+            self.hits += int(hit)
+            self.fallbacks += int(fallback)
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def metrics(self):
+        """
+        Return the size and lookup statistics of this worker's index.
+
+        Returns:
+            dict: Entry and offer counts, estimated bytes, budget state, and lookup and rebuild times in milliseconds.
+        """
+        with self.lock:
+            return {
+                'built': self.built_at is not None,
+                'over_budget': self.over_budget,
+                'offers': len(self.titles),
+                'entries': len(self.entries),
+                'estimated_bytes': self.estimated_bytes,
+                'memory_budget': settings.OFFER_SUGGEST_MEMORY_BUDGET,
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'database_fallbacks': self.fallbacks,
+                'avg_latency_ms': round(self.total_latency / self.lookups * 1000, 3) if self.lookups else 0,
+                'max_latency_ms': round(self.max_latency * 1000, 3),
+                'rebuilds': self.rebuilds,
+                'last_rebuild_ms': round(self.last_rebuild * 1000, 3),
+                'max_rebuild_ms': round(self.max_rebuild * 1000, 3),
+            }
+
+
+title_index = TitleSuggestionIndex()
+
+
+def offer_titles_changed(offers):
+    """
+    Update the suggestion index with the given offers once the transaction commits.
+
+    Args:
+        offers (list): Saved Offer instances.
+    """
+    changes = [(offer.pk, offer.title) for offer in offers]
+
+    def apply():
+        for offer_id, title in changes:
+            title_index.add(offer_id, title)
+
+    transaction.on_commit(apply)
+
+
+def offer_removed(offer_id):
+    """
+    Remove an offer from the suggestion index once the transaction commits.
+
+    Args:
+        offer_id (int): The id of the deleted offer.
+    """
+    transaction.on_commit(lambda: title_index.remove(offer_id))
@@ -0,0 +1,88 @@
+import asyncio
+import json
+from asgiref.sync import iscoroutinefunction
+from django.urls import resolve, reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from rest_framework import status
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail, Order, OrderCount, Review
+
+
+class AsyncViewsTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.customer_user = User.objects.create_user(username='customer', password='testpassword', email='customer@gmail.com')
+        self.business_user = User.objects.create_user(username='business', password='testpassword', email='business@gmail.com')
+        Profile.objects.filter(user=self.business_user).update(type='business')
+        self.token = Token.objects.create(user=self.customer_user)
+        self.auth_header = {'Authorization': 'Token ' + self.token.key}
+
+        self.offer = Offer.objects.create(user=self.business_user, title='Logo Design', description='Logos')
+        self.detail = OfferDetail.objects.create(offer=self.offer, title='Basic', revisions=1, delivery_time_in_days=3, price=50, features=['Logo'], offer_type='basic')
+        self.offer.refresh_min_values()
+        Order.objects.create(
+            offer_detail=self.detail, customer_user=self.customer_user, business_user=self.business_user,
+            title='Basic', revisions=1, delivery_time_in_days=3, price=50, features=['Logo'], offer_type='basic',
+        )
+        OrderCount.adjust(self.business_user.id, 'in_progress', 1)
+        Review.objects.create(reviewer=self.customer_user, business_user=self.business_user, rating=4, description='Good')
+
+    def test_read_endpoints_are_async(self):
+        urls = [
+            reverse('offer-list'),
+            reverse('offer-detail', kwargs={'pk': self.offer.id}),
+            reverse('review-list'),
+            reverse('base-info'),
+            reverse('order-count', kwargs={'business_user_id': self.business_user.id}),
+            reverse('completed-order-count', kwargs={'business_user_id': self.business_user.id}),
+            reverse('order-status-count', kwargs={'business_user_id': self.business_user.id}),
+        ]
+        for url in urls:
+            self.assertTrue(iscoroutinefunction(resolve(url).func), url)
+
+    async def test_concurrent_async_requests(self):
+        business_id = self.business_user.id
+        offer_id = self.offer.id
+        responses = await asyncio.gather(
+            self.async_client.get(reverse('offer-list')),
+            self.async_client.get(reverse('offer-detail', kwargs={'pk': offer_id}), headers=self.auth_header),
+            self.async_client.get(reverse('review-list'), headers=self.auth_header),
+            self.async_client.get(reverse('base-info')),
+            self.async_client.get(reverse('order-count', kwargs={'business_user_id': business_id}), headers=self.auth_header),
+        )
+        for response in responses:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        offers, offer, reviews, base_info, order_count = [response.json() for response in responses]
+        self.assertEqual(offers['count'], 1)
+        self.assertEqual(offer['id'], offer_id)
+        self.assertEqual(reviews['count'], 1)
+        self.assertEqual(base_info['offer_count'], 1)
+        self.assertEqual(order_count, {'order_count': 1})
+
+    async def test_async_retrieve_not_found(self):
+        response = await self.async_client.get(reverse('offer-detail', kwargs={'pk': 999}), headers=self.auth_header)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_async_list_requires_authentication(self):
+        response = await self.async_client.get(reverse('review-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_async_create_runs_sync_action(self):
+        response = await self.async_client.post(
+            reverse('order-list'), {'offer_detail_id': self.detail.id}, content_type='application/json', headers=self.auth_header,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(await Order.objects.acount(), 2)
+
+    async def test_async_export_streams_from_async_iterator(self):
+        response = await self.async_client.get(reverse('order-list'), {'export': 'stream'}, headers=self.auth_header)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        orders = json.loads(content)
+        self.assertEqual([order['title'] for order in orders], ['Basic'])
@@ -0,0 +1,55 @@
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rest_framework import status
+from auth_app.models import Profile
+from coderr_app.models import Offer, Review
+
+
+class BaseInfoTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.customer_user = User.objects.create_user(username='customer', password='testpassword', email='customer@gmail.com')
+        self.business_user = User.objects.create_user(username='business', password='testpassword', email='business@gmail.com')
+        Profile.objects.filter(user=self.business_user).update(type='business')
+        self.review = Review.objects.create(reviewer=self.customer_user, business_user=self.business_user, rating=4, description='Good')
+        self.url = reverse('base-info')
+
+    def test_get_base_info(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'review_count': 1, 'average_rating': 4.0, 'business_profile_count': 1, 'offer_count': 0})
+        self.assertIn('ETag', response)
+        self.assertIn('max-age', response['Cache-Control'])
+
+    def test_base_info_served_from_cache(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['review_count'], 1)
+
+    def test_base_info_conditional_get(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_base_info_counters_follow_writes(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Offer.objects.create(user=self.business_user, title='Logo Design', description='Logos')
+            self.review.rating = 2
+            self.review.save()
+            profile = Profile.objects.get(user=self.customer_user)
+            profile.type = 'business'
+            profile.save()
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data, {'review_count': 1, 'average_rating': 2.0, 'business_profile_count': 2, 'offer_count': 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.review.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['review_count'], 0)
+        self.assertEqual(response.data['average_rating'], 0)
@@ -0,0 +1,112 @@
+import shutil
+import tempfile
+from io import BytesIO
+from PIL import Image
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from auth_app.models import Profile
+from coderr_app.jobs import run_pending_jobs
+from coderr_app.models import Job, Offer
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_jpeg(name='photo.jpg', size=(1600, 1200)):
+    image = Image.new('RGB', size, (200, 80, 40))
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = 'Camera Maker'
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', exif=exif.tobytes())
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImagePipelineTestCase(APITestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.business_user = User.objects.create_user(username='boss', password='testpassword', email='boss@gmail.com')
+        self.profile = Profile.objects.get(user=self.business_user)
+        self.profile.type = 'business'
+        self.profile.save()
+        self.token = Token.objects.create(user=self.business_user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def create_offer(self, image):
+        offer = Offer.objects.create(user=self.business_user, title='Logo', description='Logos', image=image)
+        with self.captureOnCommitCallbacks(execute=True):
+            run_pending_jobs()
+        offer.refresh_from_db()
+        return offer
+
+    def test_upload_is_processed_by_job(self):
+        offer = Offer.objects.create(user=self.business_user, title='Logo', description='Logos', image=make_jpeg())
+        self.assertEqual(offer.image_variants, {})
+        self.assertTrue(Job.objects.filter(name='images.process', idempotency_key=f'images:coderr_app.offer:{offer.id}:image').exists())
+
+        uploaded = offer.image.name
+        with self.captureOnCommitCallbacks(execute=True):
+            run_pending_jobs()
+        offer.refresh_from_db()
+        self.assertEqual(set(offer.image_variants), {'small', 'medium'})
+        self.assertNotEqual(offer.image.name, uploaded)
+        self.assertFalse(default_storage.exists(uploaded))
+
+    def test_upload_strips_metadata_and_creates_variants(self):
+        offer = self.create_offer(make_jpeg())
+        self.assertEqual(set(offer.image_variants), {'small', 'medium'})
+
+        with Image.open(offer.image.path) as original:
+            self.assertEqual(original.size, (1200, 1600))
+            self.assertFalse(original.getexif())
+        with default_storage.open(offer.image_variants['medium']) as file, Image.open(file) as medium:
+            self.assertEqual(medium.format, 'WEBP')
+            self.assertEqual(medium.size, (480, 640))
+
+    def test_list_serves_variant_and_detail_original(self):
+        offer = self.create_offer(make_jpeg())
+        response = self.client.get(reverse('offer-list'))
+        self.assertTrue(response.data['results'][0]['image'].endswith('.medium.webp'))
+
+        response = self.client.get(reverse('offer-detail', kwargs={'pk': offer.id}))
+        self.assertTrue(response.data['image'].endswith('.jpg'))
+
+    def test_replaced_image_removes_old_variants(self):
+        offer = self.create_offer(make_jpeg())
+        old_variants = list(offer.image_variants.values())
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.image = make_jpeg('second.jpg', size=(300, 200))
+            offer.save()
+        self.assertEqual(offer.image_variants, {})
+        self.assertTrue(all(not default_storage.exists(name) for name in old_variants))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            run_pending_jobs()
+        offer.refresh_from_db()
+        with default_storage.open(offer.image_variants['medium']) as file, Image.open(file) as medium:
+            self.assertEqual(medium.size, (200, 300))
+
+    def test_profile_upload_served_as_small_variant(self):
+        url = reverse('profile-detail', kwargs={'pk': self.business_user.id})
+        response = self.client.patch(url, {'file': make_jpeg('avatar.jpg')}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        run_pending_jobs()
+        self.profile.refresh_from_db()
+        self.assertEqual(set(self.profile.file_variants), {'small', 'medium'})
+
+        response = self.client.get(reverse('profiles-list-business'), {'fields': 'user,file'})
+        self.assertTrue(response.data['results'][0]['file'].endswith('.small.webp'))
@@ -0,0 +1,128 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from coderr_app.jobs import claim_jobs, enqueue, job, run_job, run_pending_jobs
+from coderr_app.models import Job
+
+calls = []
+
+
+@job('tests.record')
+def record(value):
+    calls.append(value)
+
+
+@job('tests.fail')
+def fail(value):
+    raise RuntimeError(f'Cannot handle {value}.')
+
+
+@override_settings(JOB_MAX_ATTEMPTS=3, JOB_RETRY_DELAY=10)
+class JobQueueTestCase(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_job_runs_and_is_deleted(self):
+        enqueue('tests.record', {'value': 1})
+        self.assertEqual(run_pending_jobs(), (1, 0))
+        self.assertEqual(calls, [1])
+        self.assertFalse(Job.objects.exists())
+
+    def test_unknown_job_name(self):
+        with self.assertRaises(ValueError):
+            enqueue('tests.missing')
+
+    def test_pending_job_takes_the_latest_payload(self):
+        enqueue('tests.record', {'value': 1}, idempotency_key='record:1')
+        enqueue('tests.record', {'value': 2}, idempotency_key='record:1')
+        self.assertEqual(list(Job.objects.values_list('payload', flat=True)), [{'value': 2}])
+
+    def test_job_claimed_during_enqueue_is_queued_again(self):
+        # A worker claims the pending job between the conflicting insert and
+        # the commit of the write; the write must still get a job of its own.
+        enqueue('tests.record', {'value': 1}, idempotency_key='record:1')
+        insert = Job.objects.bulk_create
+        claimed = []
+
+        def insert_then_claim(*args, **kwargs):
+            result = insert(*args, **kwargs)
+            if not claimed:
+                claimed.extend(claim_jobs('worker', 10))
+            return result
+
+        with transaction.atomic(), mock.patch.object(Job.objects, 'bulk_create', side_effect=insert_then_claim):
+            enqueue('tests.record', {'value': 2}, idempotency_key='record:1')
+        self.assertEqual([claimed_job.payload for claimed_job in claimed], [{'value': 1}])
+        self.assertEqual(list(Job.objects.filter(status='pending').values_list('payload', flat=True)), [{'value': 2}])
+
+    def test_rolled_back_write_drops_job(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            enqueue('tests.record', {'value': 1})
+            raise RuntimeError('Write failed.')
+        self.assertFalse(Job.objects.exists())
+
+    def test_idempotency_key_deduplicates_pending_jobs(self):
+        enqueue('tests.record', {'value': 1}, idempotency_key='record:1')
+        enqueue('tests.record', {'value': 1}, idempotency_key='record:1')
+        self.assertEqual(Job.objects.count(), 1)
+
+        claim_jobs('worker', 10)
+        enqueue('tests.record', {'value': 1}, idempotency_key='record:1')
+        self.assertEqual(Job.objects.filter(status='pending').count(), 1)
+
+    def test_failed_job_is_retried_with_backoff(self):
+        enqueue('tests.fail', {'value': 1})
+        self.assertEqual(run_pending_jobs(), (0, 1))
+        failed_job = Job.objects.get()
+        self.assertEqual((failed_job.status, failed_job.attempts), ('pending', 1))
+        self.assertIn('Cannot handle 1.', failed_job.last_error)
+        self.assertGreater(failed_job.run_after, timezone.now() + timedelta(seconds=5))
+
+        Job.objects.update(run_after=timezone.now())
+        run_pending_jobs()
+        self.assertGreater(Job.objects.get().run_after, timezone.now() + timedelta(seconds=15))
+
+        Job.objects.update(run_after=timezone.now())
+        run_pending_jobs()
+        failed_job = Job.objects.get()
+        self.assertEqual((failed_job.status, failed_job.attempts), ('failed', 3))
+
+    def test_retry_superseded_by_pending_job(self):
+        enqueue('tests.fail', {'value': 1}, idempotency_key='fail:1')
+        claimed_job = claim_jobs('worker', 10)[0]
+        enqueue('tests.fail', {'value': 2}, idempotency_key='fail:1')
+
+        self.assertFalse(run_job(claimed_job))
+        self.assertEqual(list(Job.objects.values_list('payload', flat=True)), [{'value': 2}])
+
+    def test_stale_running_job_is_claimed_again(self):
+        enqueue('tests.record', {'value': 1})
+        claim_jobs('crashed-worker', 10)
+        self.assertEqual(run_pending_jobs(), (0, 0))
+
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(run_pending_jobs(), (1, 0))
+        self.assertEqual(calls, [1])
+
+    def test_run_jobs_command_requires_shared_cache(self):
+        with self.assertRaisesMessage(CommandError, 'CACHE_BACKEND'):
+            call_command('run_jobs', '--once', stdout=StringIO())
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'test_shared_cache'}})
+    def test_run_jobs_command(self):
+        enqueue('tests.record', {'value': 1})
+        enqueue('tests.fail', {'value': 2}, max_attempts=1)
+        out = StringIO()
+        call_command('run_jobs', '--once', stdout=out)
+        self.assertIn('1 job(s) done, 1 failed.', out.getvalue())
+        self.assertEqual(Job.objects.get().status, 'failed')
+
+        call_command('run_jobs', '--once', '--retry-failed', stdout=out)
+        self.assertIn('Queued 1 failed job(s) again.', out.getvalue())
+        self.assertEqual(Job.objects.get().attempts, 1)
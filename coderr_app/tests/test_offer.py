@@ -1,4 +1,11 @@
+import json
+import tempfile
+from io import StringIO
 from django.urls import reverse
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase, APIClient
@@ -41,6 +48,7 @@ class OfferTestCase(APITestCase):
         self.basic = OfferDetail.objects.create(offer = self.offer, title = 'Basic Model', revisions = 3, delivery_time_in_days = 5, price = 500, features= ['simple_website', 'simple dashbord'], offer_type = 'basic')
         self.standard = OfferDetail.objects.create(offer = self.offer, title = 'Standard Model', revisions = 5, delivery_time_in_days = 7, price = 1000, features= ['simple_website', 'Custom dashbord', 'customer Service' ], offer_type = 'standard')
         self.premium = OfferDetail.objects.create(offer = self.offer, title = 'Premium Model', revisions = 8, delivery_time_in_days = 10, price = 3000, features= ['custom design','simple_website', 'Custom dashbord', 'customer Service'], offer_type = 'premium')
+        self.offer.refresh_min_values()
         
     def test_get_all_offer(self):
         url = reverse('offer-list')
@@ -108,6 +116,9 @@ class OfferTestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Offer.objects.count(), 2)
+        offer = Offer.objects.get(id=response.data['id'])
+        self.assertEqual(offer.min_price, 50)
+        self.assertEqual(offer.min_delivery_time, 3)
         
     def test_owner_patch_offer(self):
         url = reverse('offer-detail',  kwargs={'pk': self.offer.id})
@@ -135,6 +146,8 @@ class OfferTestCase(APITestCase):
         self.assertEqual(self.offer.title, 'Modern Developement')
         self.assertEqual(self.basic.price, 750)
         self.assertEqual(self.standard.price, 1250)
+        self.assertEqual(self.offer.min_price, 750)
+        self.assertEqual(self.offer.min_delivery_time, 5)
         
     def test_customer_patch(self):
         url = reverse('offer-detail',  kwargs={'pk': self.offer.id})
@@ -156,11 +169,99 @@ class OfferTestCase(APITestCase):
         response = self.client2.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Offer.objects.count(), 0)
-                
-    
-            
-        
-        
-        
-        
-        
+
+    def test_sync_offer_min_values_command(self):
+        Offer.objects.filter(id=self.offer.id).update(min_price=None, min_delivery_time=None)
+        with self.assertRaises(CommandError):
+            call_command('sync_offer_min_values', '--check', stdout=StringIO())
+
+        call_command('sync_offer_min_values', stdout=StringIO())
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 500)
+        self.assertEqual(self.offer.min_delivery_time, 5)
+        call_command('sync_offer_min_values', '--check', stdout=StringIO())
+
+    def test_filter_offers_without_distinct(self):
+        url = reverse('offer-list')
+        params = {'min_price': 2000, 'max_delivery_time': 6, 'ordering': 'min_price', 'page_size': 5}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(queries), 3)
+        for query in queries:
+            self.assertNotIn('DISTINCT', query['sql'].upper())
+
+        response = self.client.get(url, {'min_price': 3001})
+        self.assertEqual(response.data['count'], 0)
+        response = self.client.get(url, {'max_delivery_time': 4})
+        self.assertEqual(response.data['count'], 0)
+
+    def test_offer_list_cursor_pagination(self):
+        url = reverse('offer-list')
+        for index in range(3):
+            Offer.objects.create(user=self.business_user2, title=f'Offer {index}', description='Test')
+
+        response = self.client.get(url, {'pagination': 'cursor', 'page_size': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['id'], self.offer.id)
+        self.assertIsNone(response.data['next'])
+
+    def test_offer_list_without_count(self):
+        url = reverse('offer-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'count': 'false'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['count'])
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        for query in queries:
+            self.assertNotIn('COUNT(', query['sql'].upper())
+
+    def offer_payload(self, title):
+        return {
+            'title': title,
+            'description': 'Bulk Description',
+            'details': [
+                {'title': 'Basic', 'revisions': 1, 'delivery_time_in_days': 3, 'price': 50, 'features': ['Logo'], 'offer_type': 'basic'},
+                {'title': 'Standard', 'revisions': 3, 'delivery_time_in_days': 5, 'price': 150, 'features': ['Logo'], 'offer_type': 'standard'},
+                {'title': 'Premium', 'revisions': 6, 'delivery_time_in_days': 7, 'price': 300, 'features': ['Logo'], 'offer_type': 'premium'},
+            ],
+        }
+
+    def test_business_bulk_create_offers(self):
+        url = reverse('offer-bulk-create')
+        data = [self.offer_payload(f'Bulk Offer {index}') for index in range(5)]
+        response = self.client2.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 5)
+        self.assertEqual(OfferDetail.objects.filter(offer_id__in=response.data['ids']).count(), 15)
+        self.assertEqual(Offer.objects.get(id=response.data['ids'][0]).min_price, 50)
+
+    def test_bulk_create_offers_invalid_item(self):
+        url = reverse('offer-bulk-create')
+        invalid = self.offer_payload('Invalid')
+        invalid['details'] = invalid['details'][:2]
+        response = self.client2.post(url, [self.offer_payload('Valid'), invalid], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Offer.objects.count(), 1)
+
+    def test_customer_bulk_create_offers(self):
+        url = reverse('offer-bulk-create')
+        response = self.client1.post(url, [self.offer_payload('Bulk Offer')], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import_offers_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as file:
+            json.dump([self.offer_payload(f'Imported {index}') for index in range(3)], file)
+            file.flush()
+            call_command('import_offers', file.name, '--user', 'busy', '--batch-size', '2', stdout=StringIO())
+            with self.assertRaises(CommandError):
+                call_command('import_offers', file.name, '--user', 'admin', stdout=StringIO())
+        self.assertEqual(Offer.objects.filter(user=self.business_user2).count(), 3)
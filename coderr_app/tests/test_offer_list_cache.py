@@ -0,0 +1,138 @@
+from io import StringIO
+from unittest import mock
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail
+from coderr_app.jobs import enqueue
+from coderr_app.list_cache import get_offer_list_metrics
+
+
+class OfferListCacheTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.business_user = User.objects.create_user(username='boss', password='testpassword', email='boss@gmail.com')
+        Profile.objects.filter(user=self.business_user).update(type='business')
+        self.offer = Offer.objects.create(user=self.business_user, title='Logo Design', description='Logos')
+        self.detail = OfferDetail.objects.create(offer=self.offer, title='Basic', revisions=1, delivery_time_in_days=3, price=50, features=['Logo'], offer_type='basic')
+        self.offer.refresh_min_values()
+        self.url = reverse('offer-list')
+
+    def test_anonymous_list_served_from_cache(self):
+        response = self.client.get(self.url, {'page_size': 5, 'ordering': 'min_price'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url, {'ordering': 'min_price', 'page_size': 5})
+        self.assertEqual(cached['X-Cache'], 'HIT')
+        self.assertEqual(cached.data, response.data)
+        self.assertEqual(cached['ETag'], response['ETag'])
+
+        metrics = get_offer_list_metrics()
+        self.assertEqual((metrics['hits'], metrics['misses']), (1, 1))
+
+    def test_authenticated_list_not_cached(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=self.business_user).key)
+        client.get(self.url)
+        response = client.get(self.url)
+        self.assertNotIn('X-Cache', response)
+
+    def test_offer_writes_invalidate_cache(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.title = 'Brand Identity'
+            self.offer.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], 'Brand Identity')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.detail.delete()
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.business_user.first_name = 'Max'
+            self.business_user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['user_details']['first_name'], 'Max')
+
+    def test_anonymous_list_conditional_get(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Offer.objects.create(user=self.business_user, title='Website', description='Pages')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_invalid_filter_not_cached(self):
+        response = self.client.get(self.url, {'min_price': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_offer_list_metrics()['misses'], 1)
+        self.assertEqual(self.client.get(self.url, {'min_price': 'abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_offer_list_metrics()['hits'], 0)
+
+    def test_cache_metrics_admin_only(self):
+        url = reverse('offer-cache-metrics')
+        admin = User.objects.create_superuser(username='admin', password='testpassword', email='admin@gmail.com')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=admin).key)
+        self.client.get(self.url)
+        response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['misses'], 1)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+SHARED_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'test_shared_cache'}}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class SharedOfferListCacheTestCase(APITestCase):
+    """
+    A write in this process must invalidate the pages cached by other workers,
+    simulated by a separate cache instance that only shares the cache table.
+    """
+
+    def setUp(self):
+        call_command('createcachetable', verbosity=0)
+        self.business_user = User.objects.create_user(username='boss', password='testpassword', email='boss@gmail.com')
+        Profile.objects.filter(user=self.business_user).update(type='business')
+        self.offer = Offer.objects.create(user=self.business_user, title='Logo Design', description='Logos')
+        self.url = reverse('offer-list')
+        self.other_worker_cache = DatabaseCache('test_shared_cache', {})
+
+    def get_from_other_worker(self):
+        with mock.patch('coderr_app.list_cache.cache', self.other_worker_cache):
+            return self.client.get(self.url)
+
+    def test_write_invalidates_pages_of_other_workers(self):
+        self.assertEqual(self.get_from_other_worker()['X-Cache'], 'MISS')
+        self.assertEqual(self.get_from_other_worker()['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.title = 'Brand Identity'
+            self.offer.save()
+        response = self.get_from_other_worker()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], 'Brand Identity')
+
+        metrics = get_offer_list_metrics()
+        self.assertEqual((metrics['hits'], metrics['misses'], metrics['shared_cache']), (1, 2, True))
+
+    def test_job_invalidates_pages_of_web_workers(self):
+        self.assertEqual(self.get_from_other_worker()['X-Cache'], 'MISS')
+        enqueue('search.reindex_offers', {'offer_ids': [self.offer.id]})
+        call_command('run_jobs', '--once', stdout=StringIO())
+        self.assertEqual(self.get_from_other_worker()['X-Cache'], 'MISS')
@@ -0,0 +1,81 @@
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail
+
+
+class OfferQueryBudgetTestCase(APITestCase):
+    """
+    Asserts a fixed query budget on each offer endpoint, independent of the page size.
+    """
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username='business', password='testpassword', email='business@gmail.com')
+        Profile.objects.filter(user=self.business_user).update(type='business')
+        self.token = Token.objects.create(user=self.business_user)
+        self.business_client = APIClient()
+        self.business_client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        for index in range(6):
+            owner = User.objects.create_user(username=f'seller{index}', password='testpassword')
+            offer = Offer.objects.create(user=owner, title=f'Offer {index}', description='Description')
+            for price, offer_type in [(100, 'basic'), (200, 'standard'), (300, 'premium')]:
+                OfferDetail.objects.create(offer=offer, title=offer_type, revisions=1, delivery_time_in_days=3, price=price + index, features=[], offer_type=offer_type)
+            offer.refresh_min_values()
+        self.offer = offer
+
+    def assertQueryBudget(self, budget, client, method, url, data=None, expected_status=status.HTTP_200_OK):
+        with self.assertNumQueries(budget):
+            response = getattr(client, method)(url, data, format='json' if method != 'get' else None)
+        self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def test_offer_list_budget(self):
+        url = reverse('offer-list')
+        for page_size in (1, 6):
+            response = self.assertQueryBudget(3, self.client, 'get', url, {'page_size': page_size})
+            self.assertEqual(len(response.data['results']), page_size)
+        detail = response.data['results'][0]['details'][0]
+        self.assertEqual(detail['url'], 'http://testserver' + reverse('offerdetail-detail', kwargs={'pk': detail['id']}))
+        self.assertQueryBudget(2, self.client, 'get', url, {'pagination': 'cursor'})
+
+    def test_offer_retrieve_budget(self):
+        url = reverse('offer-detail', kwargs={'pk': self.offer.id})
+        response = self.assertQueryBudget(3, self.business_client, 'get', url)
+        self.assertEqual(response.data['min_price'], 105)
+        self.assertEqual(response.data['min_delivery_time'], 3)
+
+    def test_offer_retrieve_without_stored_min_values(self):
+        Offer.objects.filter(id=self.offer.id).update(min_price=None, min_delivery_time=None)
+        url = reverse('offer-detail', kwargs={'pk': self.offer.id})
+        response = self.assertQueryBudget(3, self.business_client, 'get', url)
+        self.assertEqual(response.data['min_price'], 105)
+
+    def test_offerdetail_retrieve_budget(self):
+        url = reverse('offerdetail-detail', kwargs={'pk': self.offer.details.first().id})
+        self.assertQueryBudget(2, self.business_client, 'get', url)
+
+    def test_offer_create_budget(self):
+        data = {
+            'title': 'New Offer',
+            'description': 'New Description',
+            'details': [
+                {'title': 'Basic', 'revisions': 1, 'delivery_time_in_days': 3, 'price': 50, 'features': ['Logo'], 'offer_type': 'basic'},
+                {'title': 'Standard', 'revisions': 3, 'delivery_time_in_days': 5, 'price': 150, 'features': ['Logo'], 'offer_type': 'standard'},
+                {'title': 'Premium', 'revisions': 6, 'delivery_time_in_days': 7, 'price': 300, 'features': ['Logo'], 'offer_type': 'premium'},
+            ],
+        }
+        # Two statements of the budget enqueue the search index job and lock it until the commit.
+        self.assertQueryBudget(8, self.business_client, 'post', reverse('offer-list'), data, status.HTTP_201_CREATED)
+
+    def test_offer_partial_update_budget(self):
+        own_offer = Offer.objects.create(user=self.business_user, title='Own', description='Description')
+        for offer_type in ('basic', 'standard', 'premium'):
+            OfferDetail.objects.create(offer=own_offer, title=offer_type, revisions=1, delivery_time_in_days=3, price=100, features=[], offer_type=offer_type)
+        url = reverse('offer-detail', kwargs={'pk': own_offer.id})
+        data = {'title': 'Updated', 'details': [{'offer_type': 'basic', 'price': 80}, {'offer_type': 'premium', 'price': 400}]}
+        # Title changes enqueue the search index job as well (two statements).
+        self.assertQueryBudget(10, self.business_client, 'patch', url, data)
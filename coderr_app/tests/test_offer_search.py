@@ -0,0 +1,89 @@
+from unittest import mock
+from io import StringIO
+from django.urls import reverse
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+from rest_framework import status
+from auth_app.models import Profile
+from coderr_app.jobs import run_pending_jobs
+from coderr_app.models import Job, Offer, OfferDetail, OfferSearchTerm
+from coderr_app.search import rebuild_index
+
+
+class OfferSearchTestCase(APITestCase):
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username='boss', password='testpassword', email='boss@gmail.com')
+        Profile.objects.filter(user=self.business_user).update(type='business')
+
+        self.logo = self.create_offer('Logo Design', 'A modern logo for your brand', price=100)
+        self.website = self.create_offer('Website Development', 'Responsive website with a custom logo', price=900)
+        self.backend = self.create_offer('Backend API', 'Django REST backend', price=1500)
+        run_pending_jobs()
+        self.url = reverse('offer-list')
+
+    def create_offer(self, title, description, price):
+        offer = Offer.objects.create(user=self.business_user, title=title, description=description)
+        OfferDetail.objects.create(offer=offer, title='Basic', revisions=1, delivery_time_in_days=3, price=price, features=['Basic'], offer_type='basic')
+        offer.refresh_min_values()
+        return offer
+
+    def search(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [offer['id'] for offer in response.data['results']]
+
+    def assertSearchBehaviour(self):
+        self.assertEqual(self.search({'search': 'logo'}), [self.logo.id, self.website.id])
+        self.assertEqual(self.search({'search': 'webs'}), [self.website.id])
+        self.assertEqual(self.search({'search': 'custom log'}), [self.website.id])
+        self.assertEqual(self.search({'search': 'logo', 'min_price': 500}), [self.website.id])
+        self.assertEqual(self.search({'search': 'logo', 'ordering': '-min_price'}), [self.website.id, self.logo.id])
+        self.assertEqual(self.search({'search': 'kotlin'}), [])
+        self.assertEqual(len(self.search({'search': '!!'})), 3)
+
+    def test_search_ranks_and_filters(self):
+        self.assertSearchBehaviour()
+
+    def test_search_inverted_index(self):
+        with mock.patch('coderr_app.search.use_fts', return_value=False):
+            rebuild_index()
+            self.assertTrue(OfferSearchTerm.objects.filter(term='logo', offer=self.logo).exists())
+            self.assertSearchBehaviour()
+
+    def test_search_single_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'search': 'logo', 'min_price': 50, 'count': 'false'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('LIKE', queries[0]['sql'].upper())
+
+    def test_index_follows_offer_changes(self):
+        self.logo.title = 'Brand Identity'
+        self.logo.description = 'Colours and fonts'
+        self.logo.save()
+        self.assertEqual(self.search({'search': 'logo'}), [self.logo.id, self.website.id])
+        run_pending_jobs()
+        self.assertEqual(self.search({'search': 'logo'}), [self.website.id])
+        self.assertEqual(self.search({'search': 'brand'}), [self.logo.id])
+
+        self.website.delete()
+        run_pending_jobs()
+        self.assertEqual(self.search({'search': 'logo'}), [])
+
+    def test_repeated_writes_enqueue_one_reindex(self):
+        for title in ['Logo v2', 'Logo v3', 'Logo v4']:
+            self.logo.title = title
+            self.logo.save()
+        self.assertEqual(Job.objects.filter(name='search.reindex_offers', idempotency_key=f'search:offer:{self.logo.id}').count(), 1)
+        run_pending_jobs()
+        self.assertEqual(self.search({'search': 'v4'}), [self.logo.id])
+
+    def test_rebuild_search_index_command(self):
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Indexed 3 offer(s).', out.getvalue())
+        self.assertEqual(self.search({'search': 'django'}), [self.backend.id])
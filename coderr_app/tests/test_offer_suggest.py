@@ -0,0 +1,106 @@
+import threading
+from unittest import mock
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from auth_app.models import Profile
+from coderr_app.jobs import run_pending_jobs
+from coderr_app.models import Offer
+from coderr_app.suggest import title_index
+
+
+class OfferSuggestTestCase(APITestCase):
+
+    def setUp(self):
+        title_index.reset()
+        title_index.reset_metrics()
+        self.business_user = User.objects.create_user(username='boss', password='testpassword', email='boss@gmail.com')
+        Profile.objects.filter(user=self.business_user).update(type='business')
+        self.logo = Offer.objects.create(user=self.business_user, title='Logo Design', description='Logos')
+        self.landing = Offer.objects.create(user=self.business_user, title='Landing Page Design', description='Pages')
+        self.backend = Offer.objects.create(user=self.business_user, title='Django Backend', description='APIs')
+        run_pending_jobs()
+        self.url = reverse('offer-suggest')
+
+    def suggest(self, query, **params):
+        response = self.client.get(self.url, {'q': query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [suggestion['id'] for suggestion in response.data]
+
+    def test_suggest_title_prefixes(self):
+        self.assertEqual(self.suggest('lo'), [self.logo.id])
+        self.assertEqual(self.suggest('DES'), [self.logo.id, self.landing.id])
+        self.assertEqual(self.suggest('landing page d'), [self.landing.id])
+        self.assertEqual(self.suggest('design', limit=1), [self.logo.id])
+        self.assertEqual(self.suggest('kotlin'), [])
+        self.assertEqual(self.suggest(''), [])
+
+    def test_suggest_without_queries_once_built(self):
+        self.suggest('lo')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest('dj'), [self.backend.id])
+
+    def test_index_follows_offer_signals(self):
+        self.suggest('lo')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.logo.title = 'Brand Identity'
+            self.logo.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            created = Offer.objects.create(user=self.business_user, title='Logo Animation', description='Motion')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend.delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest('lo'), [created.id])
+            self.assertEqual(self.suggest('bra'), [self.logo.id])
+            self.assertEqual(self.suggest('dj'), [])
+
+    def test_rebuild_does_not_block_lookups(self):
+        self.suggest('lo')
+        loaded = title_index.load()
+        loading, release = threading.Event(), threading.Event()
+
+        def slow_load():
+            loading.set()
+            release.wait(5)
+            return loaded
+
+        with mock.patch.object(title_index, 'load', slow_load):
+            rebuild = threading.Thread(target=title_index.build)
+            rebuild.start()
+            self.assertTrue(loading.wait(5))
+            self.assertEqual(self.suggest('lo'), [self.logo.id])
+            with self.captureOnCommitCallbacks(execute=True):
+                self.logo.title = 'Lotus Branding'
+                self.logo.save()
+            release.set()
+            rebuild.join(5)
+
+        self.assertEqual(self.suggest('lotus'), [self.logo.id])
+        self.assertEqual(self.suggest('logo'), [])
+        metrics = title_index.metrics()
+        self.assertEqual(metrics['rebuilds'], 2)
+        self.assertGreaterEqual(metrics['max_rebuild_ms'], metrics['last_rebuild_ms'])
+
+    @override_settings(OFFER_SUGGEST_MEMORY_BUDGET=100)
+    def test_over_budget_falls_back_to_database(self):
+        self.assertEqual(self.suggest('lo'), [self.logo.id])
+        self.assertTrue(title_index.metrics()['over_budget'])
+        self.assertEqual(title_index.metrics()['database_fallbacks'], 1)
+
+    def test_suggest_metrics_admin_only(self):
+        self.suggest('lo')
+        url = reverse('offer-suggest-metrics')
+        admin = User.objects.create_superuser(username='admin', password='testpassword', email='admin@gmail.com')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=admin).key)
+        response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['offers'], 3)
+        self.assertEqual(response.data['lookups'], 1)
+        self.assertGreater(response.data['estimated_bytes'], 0)
+
+        client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=self.business_user).key)
+        self.assertEqual(client.get(url).status_code, status.HTTP_403_FORBIDDEN)
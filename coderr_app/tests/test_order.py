@@ -1,10 +1,14 @@
+import json
+from io import StringIO
 from django.urls import reverse
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from auth_app.models import Profile
-from coderr_app.models import Offer, OfferDetail, Order
+from coderr_app.models import Offer, OfferDetail, Order, OrderCount
 
 
 class OrderTestCase(APITestCase):
@@ -113,7 +117,26 @@ class OrderTestCase(APITestCase):
         url = reverse('order-list')
         response = self.client2.get(url) # 'client2' customer or business user can only see they orders.
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_export_orders_stream(self):
+        url = reverse('order-list')
+        response = self.client2.get(url, {'export': 'stream'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        orders = json.loads(b''.join(response.streaming_content))
+        self.assertEqual({order['id'] for order in orders}, {self.order1.id, self.order4.id})
+
+    def test_get_orders_cursor_pagination(self):
+        url = reverse('order-list')
+        response = self.client2.get(url, {'pagination': 'cursor', 'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([order['id'] for order in response.data['results']], [self.order4.id])
+
+        response = self.client2.get(response.data['next'])
+        self.assertEqual([order['id'] for order in response.data['results']], [self.order1.id])
+        self.assertIsNone(response.data['next'])
     
     def test_customer_create_order(self):
         """
@@ -167,4 +190,102 @@ class OrderTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Order.objects.filter(id=self.order3.id).exists())
     
-    
\ No newline at end of file
+    
+    def test_order_counters_follow_writes(self):
+        """
+        Test that the order counters follow order creation, status updates and deletion.
+        """
+        response = self.client4.post(reverse('order-list'), {'offer_detail_id': self.premium2.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order_id = response.data['id']
+
+        count_url = reverse('order-count', kwargs={'business_user_id': self.business_user2.id})
+        completed_url = reverse('completed-order-count', kwargs={'business_user_id': self.business_user2.id})
+        self.assertEqual(self.client1.get(count_url).data, {'order_count': 1})
+
+        self.client3.patch(reverse('order-detail', kwargs={'pk': order_id}), {'status': 'completed'}, format='json')
+        self.assertEqual(self.client1.get(count_url).data, {'order_count': 0})
+        self.assertEqual(self.client1.get(completed_url).data, {'completed_order_count': 1})
+
+        self.client.delete(reverse('order-detail', kwargs={'pk': order_id}))
+        response = self.client1.get(reverse('order-status-count', kwargs={'business_user_id': self.business_user2.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'in_progress': 0, 'completed': 0, 'cancelled': 0})
+
+    def test_order_counters_follow_cascaded_deletes(self):
+        """
+        Test that deleting a customer user removes their orders from the business user's counters.
+        """
+        response = self.client4.post(reverse('order-list'), {'offer_detail_id': self.premium2.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        count_url = reverse('order-count', kwargs={'business_user_id': self.business_user2.id})
+        self.assertEqual(self.client1.get(count_url).data, {'order_count': 1})
+
+        self.customer_user2.delete()
+        self.assertEqual(self.client1.get(count_url).data, {'order_count': 0})
+
+    def test_sync_order_counts_command(self):
+        """
+        Test that sync_order_counts reports and repairs counters that drifted from the orders.
+        """
+        with self.assertRaises(CommandError):
+            call_command('sync_order_counts', '--check', stdout=StringIO())
+
+        out = StringIO()
+        call_command('sync_order_counts', stdout=out)
+        self.assertNotIn('Updated 0 counter(s).', out.getvalue())
+        expected = Order.objects.filter(business_user=self.business_user, status='in_progress').count()
+        self.assertEqual(OrderCount.objects.get(business_user=self.business_user, status='in_progress').count, expected)
+
+        out = StringIO()
+        call_command('sync_order_counts', '--check', stdout=out)
+        self.assertIn('All order counters are in sync.', out.getvalue())
+
+    def test_order_count_single_query(self):
+        """
+        Test that the order count is read with one query after authentication.
+        """
+        url = reverse('order-count', kwargs={'business_user_id': self.business_user.id})
+        with self.assertNumQueries(2):
+            response = self.client1.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_order_count_not_business_user(self):
+        """
+        Test that the order count of a customer user is not found.
+        """
+        url = reverse('order-count', kwargs={'business_user_id': self.customer_user.id})
+        response = self.client1.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_customer_bulk_create_orders(self):
+        """
+        Test that a customer can place several orders at once and gets a result per item.
+        """
+        url = reverse('order-bulk-create')
+        data = {'offer_detail_ids': [self.basic.id, self.premium2.id, self.premium2.id, 999999]}
+        OrderCount.objects.create(business_user=self.business_user, status='in_progress')
+        OrderCount.objects.create(business_user=self.business_user2, status='in_progress')
+        with self.assertNumQueries(7):
+            response = self.client4.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([result['status'] for result in response.data['results']], ['created', 'created', 'created', 'error'])
+        self.assertEqual(response.data['results'][1]['order']['business_user'], self.business_user2.id)
+        self.assertEqual(Order.objects.filter(customer_user=self.customer_user2).count(), 5)
+
+        response = self.client1.get(reverse('order-count', kwargs={'business_user_id': self.business_user2.id}))
+        self.assertEqual(response.data, {'order_count': 2})
+
+    def test_bulk_create_orders_rejects_own_offers(self):
+        """
+        Test that business users cannot bulk order and self-orders are rejected per item.
+        """
+        url = reverse('order-bulk-create')
+        response = self.client3.post(url, {'offer_detail_ids': [self.basic.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.profile3.type = 'customer'
+        self.profile3.save()
+        response = self.client3.post(url, {'offer_detail_ids': [self.premium2.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['results'][0]['detail'], 'You cannot order your own offer.')
@@ -0,0 +1,75 @@
+import re
+from unittest import skipUnless
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail, Order, Review
+
+FULL_SCAN = re.compile(r'\bSCAN (\w+)\s*$')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked with SQLite EXPLAIN QUERY PLAN.')
+class QueryPlanTestCase(APITestCase):
+    """
+    Runs EXPLAIN QUERY PLAN on every query an endpoint executes and fails
+    if one of them falls back to a full table scan.
+    """
+
+    def setUp(self):
+        self.customer_user = User.objects.create_user(username='customer', password='testpassword', email='customer@gmail.com')
+        self.business_user = User.objects.create_user(username='business', password='testpassword', email='business@gmail.com')
+        Profile.objects.filter(user=self.business_user).update(type='business')
+
+        self.token = Token.objects.create(user=self.customer_user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        self.offer = Offer.objects.create(user=self.business_user, title='Logo Design', description='Logos for your brand')
+        self.detail = OfferDetail.objects.create(offer=self.offer, title='Basic', revisions=1, delivery_time_in_days=3, price=50, features=['Logo'], offer_type='basic')
+        self.offer.refresh_min_values()
+        Order.objects.create(
+            offer_detail=self.detail, customer_user=self.customer_user, business_user=self.business_user,
+            title='Basic', revisions=1, delivery_time_in_days=3, price=50, features=['Logo'], offer_type='basic',
+        )
+        Review.objects.create(reviewer=self.customer_user, business_user=self.business_user, rating=4, description='Good')
+
+    def assertNoFullTableScan(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for query in queries:
+            if not query['sql'].lstrip().upper().startswith('SELECT'):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                plan = [row[-1] for row in cursor.fetchall()]
+            for line in plan:
+                self.assertIsNone(FULL_SCAN.search(line), f'Full table scan in {url}: {query["sql"]}\n' + '\n'.join(plan))
+
+    def test_offer_list(self):
+        self.assertNoFullTableScan(reverse('offer-list'))
+        self.assertNoFullTableScan(reverse('offer-list'), {'creator_id': self.business_user.id})
+        self.assertNoFullTableScan(reverse('offer-list'), {'ordering': 'min_price'})
+        self.assertNoFullTableScan(reverse('offer-list'), {'search': 'logo'})
+
+    def test_order_list(self):
+        self.assertNoFullTableScan(reverse('order-list'))
+
+    def test_order_counts(self):
+        self.assertNoFullTableScan(reverse('order-count', kwargs={'business_user_id': self.business_user.id}))
+        self.assertNoFullTableScan(reverse('completed-order-count', kwargs={'business_user_id': self.business_user.id}))
+
+    def test_review_list(self):
+        self.assertNoFullTableScan(reverse('review-list'))
+        self.assertNoFullTableScan(reverse('review-list'), {'business_user_id': self.business_user.id})
+        self.assertNoFullTableScan(reverse('review-list'), {'reviewer_id': self.customer_user.id})
+
+    def test_profile_lists(self):
+        self.assertNoFullTableScan(reverse('profiles-list-business'))
+        self.assertNoFullTableScan(reverse('profiles-list-customer'), {'fields': 'user,username'})
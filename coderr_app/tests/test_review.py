@@ -1,10 +1,17 @@
+import json
+from decimal import Decimal
+from io import StringIO
 from django.urls import reverse
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APIRequestFactory, APITestCase, APIClient
 from rest_framework import status
 from auth_app.models import Profile
-from coderr_app.models import Offer, OfferDetail, Order, Review
+from coderr_app.api.serializers import ReviewSerializer
+from coderr_app.models import Offer, OfferDetail, Order, RatingSummary, Review
+from coderr_app.stats import reconcile_stats
 
 
 class ReviewTestCase(APITestCase):
@@ -59,7 +66,28 @@ class ReviewTestCase(APITestCase):
         url = reverse('review-list')
         response = self.client1.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_export_reviews_stream(self):
+        url = reverse('review-list')
+        response = self.client1.get(url, {'export': 'stream', 'business_user_id': self.business_user.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        reviews = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([review['id'] for review in reviews], [self.review1.id])
+
+    def test_get_reviews_cursor_pagination(self):
+        url = reverse('review-list')
+        response = self.client1.get(url, {'pagination': 'cursor', 'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['id'], self.review2.id)
+
+        response = self.client1.get(response.data['next'])
+        self.assertEqual(response.data['results'][0]['id'], self.review1.id)
+        self.assertIsNone(response.data['next'])
+
+        response = self.client1.get(url, {'pagination': 'cursor', 'cursor': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         
     def test_customer_create_review(self):
         url = reverse('review-list')
@@ -105,4 +133,75 @@ class ReviewTestCase(APITestCase):
     def test_business_delete_review(self):
         url = reverse('review-detail', kwargs={'pk': self.review1.id})
         response = self.client2.delete(url)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_rating_summary_follows_review_writes(self):
+        url = reverse('review-list')
+        data = {'business_user': self.business_user2.id, 'rating': 5, 'description': 'Great work'}
+        response = self.client1.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        review_id = response.data['id']
+
+        summary = RatingSummary.objects.get(business_user=self.business_user2)
+        self.assertEqual((summary.review_count, summary.rating_sum, summary.rating_5), (2, 8, 1))
+
+        self.client1.patch(reverse('review-detail', kwargs={'pk': review_id}), {'rating': 2}, format='json')
+        summary.refresh_from_db()
+        self.assertEqual(summary.histogram, {1: 0, 2: 1, 3: 1, 4: 0, 5: 0})
+        self.assertEqual(summary.average_rating, Decimal('2.5'))
+
+        self.client1.delete(reverse('review-detail', kwargs={'pk': review_id}))
+        summary.refresh_from_db()
+        self.assertEqual((summary.review_count, summary.rating_sum, summary.average_rating), (1, 3, 3))
+
+    def test_rating_summary_follows_orm_writes(self):
+        """
+        Test that reviews written outside the API are kept in the summary and the base-info counters.
+        """
+        review = Review.objects.create(business_user=self.business_user2, reviewer=self.customer_user, rating=5, description='Great work')
+        self.assertEqual(reconcile_stats()['review_count'], Review.objects.count())
+
+        review.rating = 1
+        review.save()
+        Review(pk=self.review2.pk, business_user=self.business_user2, reviewer=self.customer_user2, rating=4, description='Better now', created_at=self.review2.created_at).save()
+        summary = RatingSummary.objects.get(business_user=self.business_user2)
+        self.assertEqual(summary.histogram, {1: 1, 2: 0, 3: 0, 4: 1, 5: 0})
+        self.assertEqual(reconcile_stats()['rating_sum'], 1 + 4 + self.review1.rating)
+
+    def test_stale_review_updates_use_the_stored_rating(self):
+        """
+        Test that an update applies the rating delta against the stored rating, not the rating it was loaded with.
+        """
+        first, second = Review.objects.get(pk=self.review2.pk), Review.objects.get(pk=self.review2.pk)
+        request = APIRequestFactory().patch('/')
+        for instance, rating in ((first, 5), (second, 1)):
+            serializer = ReviewSerializer(instance, data={'rating': rating}, partial=True, context={'request': request})
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        summary = RatingSummary.objects.get(business_user=self.business_user2)
+        self.assertEqual((summary.review_count, summary.rating_sum), (1, 1))
+        self.assertEqual(summary.histogram, {1: 1, 2: 0, 3: 0, 4: 0, 5: 0})
+
+    def test_sync_rating_summaries_command(self):
+        """
+        Test that sync_rating_summaries reports and repairs summaries that drifted from the reviews.
+        """
+        RatingSummary.objects.filter(business_user=self.business_user).update(review_count=5, rating_sum=20)
+        with self.assertRaises(CommandError):
+            call_command('sync_rating_summaries', '--check', stdout=StringIO())
+
+        out = StringIO()
+        call_command('sync_rating_summaries', stdout=out)
+        self.assertIn('Updated 1 rating summary row(s).', out.getvalue())
+        summary = RatingSummary.objects.get(business_user=self.business_user)
+        self.assertEqual((summary.review_count, summary.rating_sum, summary.average_rating), (1, 3, 3))
+
+        out = StringIO()
+        call_command('sync_rating_summaries', '--check', stdout=out)
+        self.assertIn('All rating summaries are in sync.', out.getvalue())
+
+    def test_review_rating_out_of_range(self):
+        url = reverse('review-list')
+        data = {'business_user': self.business_user2.id, 'rating': 6, 'description': 'Too good'}
+        response = self.client1.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
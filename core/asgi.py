@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# Turns off persistent database connections, see DATABASE_CONN_MAX_AGE in core.settings.
+os.environ['SERVER_INTERFACE'] = 'asgi'
 
 application = get_asgi_application()
@@ -16,19 +16,21 @@ from pathlib import Path
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+MEDIA_ROOT = os.environ.get('DJANGO_MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
 MEDIA_URL = '/media/'
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/6.0/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-1efd#cd5(wlpvtf(_*jm=7hu!e8-uhjq++j@@7315y$b!vh4%9'
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-1efd#cd5(wlpvtf(_*jm=7hu!e8-uhjq++j@@7315y$b!vh4%9')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# The production image sets DJANGO_DEBUG=false; with DEBUG on every SQL query is kept in memory.
+DEBUG = os.environ.get('DJANGO_DEBUG', 'true').lower() in ('1', 'true')
 
-ALLOWED_HOSTS = []
+# Comma separated, e.g. DJANGO_ALLOWED_HOSTS=api.example.com,localhost
+ALLOWED_HOSTS = [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
 
 
 # Application definition
@@ -84,13 +86,95 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# The database is chosen with DATABASE_ENGINE:
+# 'sqlite'     - (default) a local file, tuned for concurrent workers: WAL journal so
+#                readers never block the writer, writes wait up to DATABASE_BUSY_TIMEOUT
+#                seconds for the lock instead of failing, and IMMEDIATE transactions take
+#                the write lock up front so two writers cannot deadlock on an upgrade.
+# 'postgresql' - configured with the POSTGRES_* variables; requires psycopg.
+#                DATABASE_POOL=true uses psycopg's connection pool (pip install "psycopg[pool]").
+DATABASE_ENGINE = os.environ.get('DATABASE_ENGINE', 'sqlite')
+# Seconds a connection is kept open and reused across requests (0 closes it after every request).
+DATABASE_CONN_MAX_AGE = int(os.environ.get('DATABASE_CONN_MAX_AGE', 60))
+# Under ASGI (SERVER_INTERFACE=asgi, set by core.asgi) the ORM runs in per-request
+# threads whose persistent connections are never reused and pile up, so connections
+# are closed after every request; use DATABASE_POOL to reuse them on PostgreSQL.
+SERVER_INTERFACE = os.environ.get('SERVER_INTERFACE', 'wsgi')
+if SERVER_INTERFACE == 'asgi':
+    DATABASE_CONN_MAX_AGE = 0
+DATABASE_BUSY_TIMEOUT = int(os.environ.get('DATABASE_BUSY_TIMEOUT', 20))
+
+if DATABASE_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'coderr'),
+            'USER': os.environ.get('POSTGRES_USER', 'coderr'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': DATABASE_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
     }
-}
+    if os.environ.get('DATABASE_POOL', '').lower() in ('1', 'true'):
+        # Pooled connections are returned to the pool after each request, which
+        # requires CONN_MAX_AGE = 0.
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', 10)),
+            'timeout': DATABASE_BUSY_TIMEOUT,
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': DATABASE_CONN_MAX_AGE,
+            'OPTIONS': {
+                'timeout': DATABASE_BUSY_TIMEOUT,
+                'transaction_mode': 'IMMEDIATE',
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+            },
+        }
+    }
+
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+# Cached token and Basic auth lookups, the base-info counters and the anonymous
+# offer list pages are invalidated by deleting or bumping keys, which only reaches
+# other processes through a shared cache. CACHE_BACKEND selects it:
+# 'locmem'   - (default) per-process memory; only valid for a single process such as
+#              runserver or the test runner.
+# 'redis'    - REDIS_URL (default redis://localhost:6379/0); requires redis-py. Recommended
+#              for production, counters are incremented atomically.
+# 'database' - the CACHE_TABLE table, created with `manage.py createcachetable`.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
+        }
+    }
+elif CACHE_BACKEND == 'database':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': os.environ.get('CACHE_TABLE', 'coderr_cache'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -127,15 +211,25 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = 'static/'
+# Collected by `manage.py collectstatic`; in production nginx serves it together with MEDIA_ROOT.
+STATIC_ROOT = os.environ.get('DJANGO_STATIC_ROOT', BASE_DIR / 'staticfiles')
 
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# API authentication mode:
+# 'token'        - token authentication only; passwords are verified at login only.
+# 'cached-basic' - additionally accept HTTP Basic credentials, verified once and
+#                  cached for AUTH_BASIC_CACHE_TIMEOUT seconds.
+API_AUTH_MODE = os.environ.get('API_AUTH_MODE', 'token')
+AUTH_BASIC_CACHE_TIMEOUT = 60
+
+API_AUTHENTICATION_CLASSES = ['auth_app.api.authentication.CachedTokenAuthentication']
+if API_AUTH_MODE == 'cached-basic':
+    API_AUTHENTICATION_CLASSES.append('auth_app.api.authentication.CachedBasicAuthentication')
+
 REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.BasicAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
-    ],
+    'DEFAULT_AUTHENTICATION_CLASSES': API_AUTHENTICATION_CLASSES,
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly', 
     ],
@@ -144,6 +238,39 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Seconds a resolved auth token (user and profile) stays cached.
+AUTH_TOKEN_CACHE_TIMEOUT = 300
+
+# Platform statistics (base-info endpoint)
+# Cached counters are recomputed after this many seconds to correct drift.
+BASE_INFO_CACHE_TIMEOUT = 300
+# Max-age of the Cache-Control header sent with the base-info response.
+BASE_INFO_MAX_AGE = 30
+
+# Seconds a cached anonymous offer list page is kept; writes invalidate pages immediately.
+OFFER_LIST_CACHE_TIMEOUT = 600
+
+# Uploaded offer images and profile pictures: longest edge in pixels of the WebP
+# variants generated by the images.process job. Lists serve these instead of the originals.
+IMAGE_VARIANT_SIZES = {'small': 200, 'medium': 640}
+IMAGE_WEBP_QUALITY = 80
+
+# Background job queue (coderr_app.jobs, run by `manage.py run_jobs`)
+# Attempts before a job is marked as failed.
+JOB_MAX_ATTEMPTS = 5
+# Seconds before the first retry of a failed job; doubled with every further attempt.
+JOB_RETRY_DELAY = 10
+# Seconds after which a job claimed by a worker that never finished it may be claimed again.
+JOB_LOCK_TIMEOUT = 300
+# Seconds an idle worker waits before polling the queue again.
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1))
+
+# In-process offer title suggestion index (offers/suggest endpoint)
+# Estimated bytes the index may use per worker; above it suggestions are read from the database.
+OFFER_SUGGEST_MEMORY_BUDGET = int(os.environ.get('OFFER_SUGGEST_MEMORY_BUDGET', 32 * 1024 * 1024))
+# Seconds after which a worker rebuilds its index to pick up changes made by other workers.
+OFFER_SUGGEST_REFRESH_INTERVAL = 300
+
 
 CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:5500",
@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration of the production image.
+
+SERVER_INTERFACE=wsgi (default) serves core.wsgi with threaded sync workers,
+SERVER_INTERFACE=asgi serves core.asgi with uvicorn workers and without persistent
+database connections (CONN_MAX_AGE=0, see core.settings). The number of
+worker processes defaults to 2 * cores + 1 and can be set with WEB_CONCURRENCY.
+More than one worker requires a shared cache (CACHE_BACKEND=redis or database).
+"""
+import multiprocessing
+import os
+
+interface = os.environ.get('SERVER_INTERFACE', 'wsgi')
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Auth lookups, base-info counters and offer list pages are invalidated through the
+# cache; with a per-process cache the other workers would keep serving stale entries.
+if workers > 1 and os.environ.get('CACHE_BACKEND', 'locmem') == 'locmem':
+    raise RuntimeError('Several gunicorn workers need a shared cache: set CACHE_BACKEND=redis or database.')
+if interface == 'asgi':
+    wsgi_app = 'core.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'core.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.environ.get('WEB_THREADS', 4))
+
+keepalive = 5
+timeout = 30
+graceful_timeout = 30
+# Recycle workers now and then so slow leaks cannot accumulate.
+max_requests = 5000
+max_requests_jitter = 500
+# ACCESS_LOG='' turns the access log off.
+accesslog = os.environ.get('ACCESS_LOG', '-') or None